@@ -8,6 +8,7 @@ Description: Central configuration for the healthcare analytics platform.
 Pipeline Role: Provides consistent configuration across all pipeline components.
 """
 import os
+from dataclasses import dataclass
 from pathlib import Path
 
 # Project paths
@@ -31,25 +32,61 @@ NUM_STAFF = 150
 NUM_WARDS = 12
 NUM_YEARS = 5
 START_DATE = "2020-01-01"
+BRONZE_FACT_FORMAT = "csv"  # Options: csv, parquet (dimension tables are always CSV)
+
+SEVERITY_LEVELS = ("Mild", "Moderate", "Serious", "Critical")
+
+# Reference data records are frozen so the shared constants cannot be mutated,
+# and validated once when config is imported
+@dataclass(frozen=True, slots=True)
+class Ward:
+    ward_id: int
+    ward_name: str
+    department: str
+    bed_capacity: int
+    ward_type: str
+    floor_number: int
+
+    def __post_init__(self):
+        if not isinstance(self.ward_id, int) or self.ward_id < 1:
+            raise ValueError(f"Invalid ward_id: {self.ward_id!r}")
+        if not isinstance(self.bed_capacity, int) or self.bed_capacity < 1:
+            raise ValueError(f"Invalid bed_capacity for {self.ward_name}: {self.bed_capacity!r}")
+
+
+@dataclass(frozen=True, slots=True)
+class Diagnosis:
+    icd10_code: str
+    diagnosis_name: str
+    category: str
+    severity_level: str
+
+    def __post_init__(self):
+        if self.severity_level not in SEVERITY_LEVELS:
+            raise ValueError(f"Invalid severity_level for {self.icd10_code}: {self.severity_level!r}")
+
 
 # Ward configurations
-WARDS = [
-    {"ward_id": 1, "ward_name": "ICU", "department": "Critical Care", "bed_capacity": 20, "ward_type": "Intensive Care", "floor_number": 3},
-    {"ward_id": 2, "ward_name": "ICU-2", "department": "Critical Care", "bed_capacity": 20, "ward_type": "Intensive Care", "floor_number": 3},
-    {"ward_id": 3, "ward_name": "Emergency", "department": "Emergency Medicine", "bed_capacity": 30, "ward_type": "Emergency", "floor_number": 1},
-    {"ward_id": 4, "ward_name": "Cardiology", "department": "Cardiac Care", "bed_capacity": 25, "ward_type": "Specialty", "floor_number": 4},
-    {"ward_id": 5, "ward_name": "Maternity", "department": "Obstetrics", "bed_capacity": 20, "ward_type": "Specialty", "floor_number": 2},
-    {"ward_id": 6, "ward_name": "Pediatrics", "department": "Pediatrics", "bed_capacity": 30, "ward_type": "Specialty", "floor_number": 2},
-    {"ward_id": 7, "ward_name": "Surgery", "department": "Surgical Services", "bed_capacity": 25, "ward_type": "Surgical", "floor_number": 5},
-    {"ward_id": 8, "ward_name": "Orthopedics", "department": "Orthopedics", "bed_capacity": 20, "ward_type": "Specialty", "floor_number": 5},
-    {"ward_id": 9, "ward_name": "Oncology", "department": "Cancer Care", "bed_capacity": 15, "ward_type": "Specialty", "floor_number": 6},
-    {"ward_id": 10, "ward_name": "General Medicine A", "department": "Internal Medicine", "bed_capacity": 40, "ward_type": "General", "floor_number": 4},
-    {"ward_id": 11, "ward_name": "General Medicine B", "department": "Internal Medicine", "bed_capacity": 40, "ward_type": "General", "floor_number": 4},
-    {"ward_id": 12, "ward_name": "Neurology", "department": "Neurosciences", "bed_capacity": 20, "ward_type": "Specialty", "floor_number": 6},
-]
+WARDS = (
+    Ward(ward_id=1, ward_name="ICU", department="Critical Care", bed_capacity=20, ward_type="Intensive Care", floor_number=3),
+    Ward(ward_id=2, ward_name="ICU-2", department="Critical Care", bed_capacity=20, ward_type="Intensive Care", floor_number=3),
+    Ward(ward_id=3, ward_name="Emergency", department="Emergency Medicine", bed_capacity=30, ward_type="Emergency", floor_number=1),
+    Ward(ward_id=4, ward_name="Cardiology", department="Cardiac Care", bed_capacity=25, ward_type="Specialty", floor_number=4),
+    Ward(ward_id=5, ward_name="Maternity", department="Obstetrics", bed_capacity=20, ward_type="Specialty", floor_number=2),
+    Ward(ward_id=6, ward_name="Pediatrics", department="Pediatrics", bed_capacity=30, ward_type="Specialty", floor_number=2),
+    Ward(ward_id=7, ward_name="Surgery", department="Surgical Services", bed_capacity=25, ward_type="Surgical", floor_number=5),
+    Ward(ward_id=8, ward_name="Orthopedics", department="Orthopedics", bed_capacity=20, ward_type="Specialty", floor_number=5),
+    Ward(ward_id=9, ward_name="Oncology", department="Cancer Care", bed_capacity=15, ward_type="Specialty", floor_number=6),
+    Ward(ward_id=10, ward_name="General Medicine A", department="Internal Medicine", bed_capacity=40, ward_type="General", floor_number=4),
+    Ward(ward_id=11, ward_name="General Medicine B", department="Internal Medicine", bed_capacity=40, ward_type="General", floor_number=4),
+    Ward(ward_id=12, ward_name="Neurology", department="Neurosciences", bed_capacity=20, ward_type="Specialty", floor_number=6),
+)
+
+# Departments in ward order, without duplicates
+DEPARTMENTS = tuple(dict.fromkeys(w.department for w in WARDS))
 
 # Staff roles
-STAFF_ROLES = [
+STAFF_ROLES = (
     "Attending Physician",
     "Resident",
     "Nurse Practitioner",
@@ -60,10 +97,10 @@ STAFF_ROLES = [
     "Occupational Therapist",
     "Respiratory Therapist",
     "Pharmacist",
-]
+)
 
 # Medication categories
-MEDICATION_CLASSES = [
+MEDICATION_CLASSES = (
     "Antibiotic",
     "Analgesic",
     "Anticoagulant",
@@ -74,23 +111,23 @@ MEDICATION_CLASSES = [
     "Bronchodilator",
     "Sedative",
     "Antidepressant",
-]
+)
 
 # Common diagnoses (ICD-10 codes)
-COMMON_DIAGNOSES = [
-    {"icd10_code": "I21.9", "diagnosis_name": "Acute Myocardial Infarction", "category": "Cardiovascular", "severity_level": "Critical"},
-    {"icd10_code": "J18.9", "diagnosis_name": "Pneumonia", "category": "Respiratory", "severity_level": "Moderate"},
-    {"icd10_code": "I50.9", "diagnosis_name": "Heart Failure", "category": "Cardiovascular", "severity_level": "Serious"},
-    {"icd10_code": "N39.0", "diagnosis_name": "Urinary Tract Infection", "category": "Genitourinary", "severity_level": "Mild"},
-    {"icd10_code": "E11.9", "diagnosis_name": "Type 2 Diabetes Mellitus", "category": "Endocrine", "severity_level": "Moderate"},
-    {"icd10_code": "I63.9", "diagnosis_name": "Cerebral Infarction (Stroke)", "category": "Neurological", "severity_level": "Critical"},
-    {"icd10_code": "J44.1", "diagnosis_name": "COPD with Exacerbation", "category": "Respiratory", "severity_level": "Moderate"},
-    {"icd10_code": "K80.2", "diagnosis_name": "Cholecystitis", "category": "Digestive", "severity_level": "Moderate"},
-    {"icd10_code": "S72.0", "diagnosis_name": "Hip Fracture", "category": "Injury", "severity_level": "Serious"},
-    {"icd10_code": "C50.9", "diagnosis_name": "Breast Cancer", "category": "Neoplasm", "severity_level": "Serious"},
-    {"icd10_code": "I10", "diagnosis_name": "Essential Hypertension", "category": "Cardiovascular", "severity_level": "Mild"},
-    {"icd10_code": "K21.9", "diagnosis_name": "GERD", "category": "Digestive", "severity_level": "Mild"},
-]
+COMMON_DIAGNOSES = (
+    Diagnosis(icd10_code="I21.9", diagnosis_name="Acute Myocardial Infarction", category="Cardiovascular", severity_level="Critical"),
+    Diagnosis(icd10_code="J18.9", diagnosis_name="Pneumonia", category="Respiratory", severity_level="Moderate"),
+    Diagnosis(icd10_code="I50.9", diagnosis_name="Heart Failure", category="Cardiovascular", severity_level="Serious"),
+    Diagnosis(icd10_code="N39.0", diagnosis_name="Urinary Tract Infection", category="Genitourinary", severity_level="Mild"),
+    Diagnosis(icd10_code="E11.9", diagnosis_name="Type 2 Diabetes Mellitus", category="Endocrine", severity_level="Moderate"),
+    Diagnosis(icd10_code="I63.9", diagnosis_name="Cerebral Infarction (Stroke)", category="Neurological", severity_level="Critical"),
+    Diagnosis(icd10_code="J44.1", diagnosis_name="COPD with Exacerbation", category="Respiratory", severity_level="Moderate"),
+    Diagnosis(icd10_code="K80.2", diagnosis_name="Cholecystitis", category="Digestive", severity_level="Moderate"),
+    Diagnosis(icd10_code="S72.0", diagnosis_name="Hip Fracture", category="Injury", severity_level="Serious"),
+    Diagnosis(icd10_code="C50.9", diagnosis_name="Breast Cancer", category="Neoplasm", severity_level="Serious"),
+    Diagnosis(icd10_code="I10", diagnosis_name="Essential Hypertension", category="Cardiovascular", severity_level="Mild"),
+    Diagnosis(icd10_code="K21.9", diagnosis_name="GERD", category="Digestive", severity_level="Mild"),
+)
 
 # Vital signs normal ranges
 VITAL_SIGNS_RANGES = {
@@ -103,7 +140,9 @@ VITAL_SIGNS_RANGES = {
     "pain_level": (0, 10),
 }
 
-# Create directories if they don't exist
-for directory in [RAW_DATA_DIR, PROCESSED_DATA_DIR, ANALYTICS_DATA_DIR]:
-    directory.mkdir(parents=True, exist_ok=True)
+
+def ensure_data_dirs() -> None:
+    """Create the data directories if they don't exist"""
+    for directory in (RAW_DATA_DIR, PROCESSED_DATA_DIR, ANALYTICS_DATA_DIR):
+        directory.mkdir(parents=True, exist_ok=True)
 
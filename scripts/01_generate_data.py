@@ -11,152 +11,195 @@ Pipeline Role: BRONZE LAYER - Initial data ingestion. Produces raw CSV files tha
 
 import sys
 from pathlib import Path
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 sys.path.append(str(Path(__file__).parent.parent))
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 from faker import Faker
-from datetime import datetime, timedelta
-import random
 from config import (
-    NUM_PATIENTS, NUM_STAFF, NUM_YEARS, START_DATE,
-    WARDS, STAFF_ROLES, MEDICATION_CLASSES, COMMON_DIAGNOSES,
-    VITAL_SIGNS_RANGES, RAW_DATA_DIR
+    NUM_PATIENTS, NUM_STAFF, NUM_YEARS, START_DATE, BRONZE_FACT_FORMAT,
+    WARDS, DEPARTMENTS, STAFF_ROLES, MEDICATION_CLASSES, COMMON_DIAGNOSES,
+    VITAL_SIGNS_RANGES, RAW_DATA_DIR, ensure_data_dirs
 )
 
 fake = Faker()
 Faker.seed(42)
-random.seed(42)
-np.random.seed(42)
+rng = np.random.default_rng(42)
 
 print("MediCare Analytics - Data Generation Script")
 print("=" * 60)
 
+# Ward projections used by several generators. Departments keep one entry per
+# ward so departments with more wards stay proportionally more likely.
+_WARD_IDS = np.array([w.ward_id for w in WARDS], dtype=np.int16)
+_WARD_NAMES = np.array([w.ward_name for w in WARDS])
+_WARD_CAPACITIES = np.array([w.bed_capacity for w in WARDS])
+_DEPARTMENTS = tuple(w.department for w in WARDS)
+
+# Faker providers are slow per call, so build small value pools once and
+# sample from them with the numpy Generator
+_MALE_FIRST_NAME_POOL = [fake.first_name_male() for _ in range(512)]
+_FEMALE_FIRST_NAME_POOL = [fake.first_name_female() for _ in range(512)]
+_STREET_POOL = [fake.street_address() for _ in range(512)]
+_CITY_POOL = [fake.city() for _ in range(128)]
+_STATE_POOL = [fake.state_abbr() for _ in range(64)]
+_ZIPCODE_POOL = [fake.zipcode() for _ in range(256)]
+_PHONE_POOL = [fake.phone_number() for _ in range(512)]
+_EMAIL_POOL = [fake.email() for _ in range(512)]
+_DRUG_STEM_POOL = [fake.word().capitalize() for _ in range(256)]
+
+# Real procedure names read better than Faker catch phrases and cost nothing to sample
+_PROCEDURE_NAMES = (
+    'Appendectomy', 'Cholecystectomy', 'Colonoscopy', 'Upper Endoscopy', 'Bronchoscopy',
+    'Cardiac Catheterization', 'Coronary Angioplasty', 'Coronary Artery Bypass Graft',
+    'Pacemaker Insertion', 'Echocardiogram', 'Transesophageal Echocardiogram', 'Stress Test',
+    'Electrocardiogram', 'Holter Monitoring', 'Chest X-Ray', 'CT Scan Head', 'CT Scan Abdomen',
+    'MRI Brain', 'MRI Spine', 'Abdominal Ultrasound', 'Doppler Ultrasound', 'Mammography',
+    'Lumbar Puncture', 'Thoracentesis', 'Paracentesis', 'Bone Marrow Biopsy', 'Skin Biopsy',
+    'Breast Biopsy', 'Central Line Placement', 'PICC Line Insertion', 'Arterial Line Placement',
+    'Endotracheal Intubation', 'Tracheostomy', 'Mechanical Ventilation', 'Blood Transfusion',
+    'Hemodialysis', 'Chemotherapy Infusion', 'Radiation Therapy', 'Hip Replacement',
+    'Knee Replacement', 'Open Reduction Internal Fixation', 'Arthroscopy', 'Spinal Fusion',
+    'Laminectomy', 'Carpal Tunnel Release', 'Hernia Repair', 'Bowel Resection', 'Mastectomy',
+    'Hysterectomy', 'Cesarean Section', 'Dilation and Curettage', 'Cystoscopy',
+    'Transurethral Resection of Prostate', 'Lithotripsy', 'Craniotomy', 'Carotid Endarterectomy',
+    'Thrombectomy', 'Wound Debridement', 'Skin Graft', 'Incision and Drainage',
+    'Physical Therapy Evaluation', 'Occupational Therapy Evaluation', 'Pulmonary Function Test',
+    'Electroencephalogram',
+)
+
 # ============================================
 # Generate Dimension Data
 # ============================================
 
-def generate_patients(n=NUM_PATIENTS):
+def _ids(n):
+    """Sequential 1-based surrogate keys as int32"""
+    return np.arange(1, n + 1, dtype=np.int32)
+
+
+def generate_patients(n=NUM_PATIENTS, rng=rng):
     """Generate patient master data"""
     print(f"Generating {n} patients...")
     
     blood_types = ['A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-']
+    blood_type_priors = [0.357, 0.063, 0.085, 0.015, 0.034, 0.006, 0.374, 0.066]  # US population
     genders = ['Male', 'Female', 'Other']
+    gender_priors = [0.49, 0.49, 0.02]
     insurance_providers = ['Blue Cross', 'Aetna', 'UnitedHealthcare', 'Cigna', 'Medicare', 'Medicaid']
     
-    patients = []
-    for i in range(1, n + 1):
-        gender = random.choice(genders)
-        first_name = fake.first_name_male() if gender == 'Male' else fake.first_name_female()
-        
-        patient = {
-            'patient_id': i,
-            'mrn': f'MRN{str(i).zfill(8)}',
-            'first_name': first_name,
-            'last_name': fake.last_name(),
-            'date_of_birth': fake.date_of_birth(minimum_age=18, maximum_age=95),
-            'gender': gender,
-            'blood_type': random.choice(blood_types),
-            'address': fake.street_address(),
-            'city': fake.city(),
-            'state': fake.state_abbr(),
-            'zip_code': fake.zipcode(),
-            'phone': fake.phone_number(),
-            'email': fake.email(),
-            'insurance_provider': random.choice(insurance_providers),
-            'emergency_contact_name': fake.name(),
-            'emergency_contact_phone': fake.phone_number(),
-            'effective_date': START_DATE,
-            'end_date': None,
-            'is_current': True
-        }
-        patients.append(patient)
+    # Draw categorical columns in one shot instead of per patient
+    gender = rng.choice(genders, n, p=gender_priors)
+    
+    first_name = np.where(
+        gender == 'Male',
+        rng.choice(_MALE_FIRST_NAME_POOL, n),
+        rng.choice(_FEMALE_FIRST_NAME_POOL, n)
+    )
+    
+    patient_id = _ids(n)
+    
+    df = pd.DataFrame({
+        'patient_id': patient_id,
+        'mrn': np.char.add('MRN', np.char.zfill(patient_id.astype(str), 8)),
+        'first_name': first_name,
+        'last_name': [fake.last_name() for _ in range(n)],
+        'date_of_birth': [fake.date_of_birth(minimum_age=18, maximum_age=95) for _ in range(n)],
+        'gender': pd.Categorical(gender, categories=genders),
+        'blood_type': pd.Categorical(rng.choice(blood_types, n, p=blood_type_priors), categories=blood_types),
+        'address': rng.choice(_STREET_POOL, n),
+        'city': rng.choice(_CITY_POOL, n),
+        'state': rng.choice(_STATE_POOL, n),
+        'zip_code': rng.choice(_ZIPCODE_POOL, n),
+        'phone': rng.choice(_PHONE_POOL, n),
+        'email': rng.choice(_EMAIL_POOL, n),
+        'insurance_provider': pd.Categorical(rng.choice(insurance_providers, n), categories=insurance_providers),
+        'emergency_contact_name': [fake.name() for _ in range(n)],
+        'emergency_contact_phone': rng.choice(_PHONE_POOL, n),
+        'effective_date': START_DATE,
+        'end_date': None,
+        'is_current': True
+    })
     
-    df = pd.DataFrame(patients)
     print(f"[DONE] Generated {len(df)} patients")
     return df
 
-def generate_staff(n=NUM_STAFF):
+def generate_staff(n=NUM_STAFF, rng=rng):
     """Generate hospital staff"""
     print(f"Generating {n} staff members...")
     
     shift_patterns = ['Day', 'Night', 'Rotating', 'On-Call']
     
-    staff = []
-    for i in range(1, n + 1):
-        role = random.choice(STAFF_ROLES)
-        department = random.choice([w['department'] for w in WARDS])
-        
-        staff_member = {
-            'staff_id': i,
-            'first_name': fake.first_name(),
-            'last_name': fake.last_name(),
-            'role': role,
-            'department': department,
-            'shift_pattern': random.choice(shift_patterns),
-            'qualifications': f"Licensed {role}",
-            'hire_date': fake.date_between(start_date='-15y', end_date='-1y'),
-            'is_active': True
-        }
-        staff.append(staff_member)
+    role = rng.choice(STAFF_ROLES, n)
+    
+    df = pd.DataFrame({
+        'staff_id': _ids(n),
+        'first_name': [fake.first_name() for _ in range(n)],
+        'last_name': [fake.last_name() for _ in range(n)],
+        'role': pd.Categorical(role, categories=STAFF_ROLES),
+        'department': pd.Categorical(rng.choice(_DEPARTMENTS, n), categories=DEPARTMENTS),
+        'shift_pattern': pd.Categorical(rng.choice(shift_patterns, n), categories=shift_patterns),
+        'qualifications': np.char.add('Licensed ', role),
+        'hire_date': [fake.date_between(start_date='-15y', end_date='-1y') for _ in range(n)],
+        'is_active': True
+    })
     
-    df = pd.DataFrame(staff)
     print(f"[DONE] Generated {len(df)} staff members")
     return df
 
-def generate_wards():
+def generate_wards(rng=rng):
     """Generate ward/department data"""
     print(f"Generating {len(WARDS)} wards...")
     df = pd.DataFrame(WARDS)
-    df['nurse_station_contact'] = [fake.phone_number() for _ in range(len(df))]
+    df['nurse_station_contact'] = rng.choice(_PHONE_POOL, len(df))
     print(f"[DONE] Generated {len(df)} wards")
     return df
 
-def generate_medications(n=200):
+def generate_medications(n=200, rng=rng):
     """Generate medication formulary"""
     print(f"Generating {n} medications...")
     
     dosage_forms = ['Tablet', 'Capsule', 'Injection', 'IV Solution', 'Topical Cream', 'Inhaler']
     manufacturers = ['Pfizer', 'Novartis', 'Roche', 'Merck', 'GSK', 'AstraZeneca']
     
-    medications = []
-    for i in range(1, n + 1):
-        drug_class = random.choice(MEDICATION_CLASSES)
-        medications.append({
-            'medication_id': i,
-            'drug_name': fake.word().capitalize() + 'zole',
-            'generic_name': fake.word().capitalize() + 'mine',
-            'drug_class': drug_class,
-            'dosage_form': random.choice(dosage_forms),
-            'manufacturer': random.choice(manufacturers),
-            'cost_per_unit': round(random.uniform(0.5, 500), 2),
-            'contraindications': 'Allergy to ' + drug_class
-        })
-    
-    df = pd.DataFrame(medications)
+    drug_class = rng.choice(MEDICATION_CLASSES, n)
+    
+    df = pd.DataFrame({
+        'medication_id': _ids(n),
+        'drug_name': np.char.add(rng.choice(_DRUG_STEM_POOL, n), 'zole'),
+        'generic_name': np.char.add(rng.choice(_DRUG_STEM_POOL, n), 'mine'),
+        'drug_class': pd.Categorical(drug_class, categories=MEDICATION_CLASSES),
+        'dosage_form': pd.Categorical(rng.choice(dosage_forms, n), categories=dosage_forms),
+        'manufacturer': pd.Categorical(rng.choice(manufacturers, n), categories=manufacturers),
+        'cost_per_unit': np.round(rng.uniform(0.5, 500, n), 2),
+        'contraindications': np.char.add('Allergy to ', drug_class)
+    })
+    
     print(f"[DONE] Generated {len(df)} medications")
     return df
 
-def generate_procedures(n=100):
+def generate_procedures(n=100, rng=rng):
     """Generate medical procedures"""
     print(f"Generating {n} procedures...")
     
     procedure_types = ['Diagnostic', 'Therapeutic', 'Surgical', 'Rehabilitative']
     
-    procedures = []
-    for i in range(1, n + 1):
-        procedure_type = random.choice(procedure_types)
-        procedures.append({
-            'procedure_id': i,
-            'procedure_name': fake.catch_phrase().replace(',', ''),
-            'procedure_type': procedure_type,
-            'department': random.choice([w['department'] for w in WARDS]),
-            'avg_duration_minutes': random.randint(15, 480),
-            'base_cost': round(random.uniform(100, 50000), 2),
-            'requires_anesthesia': procedure_type == 'Surgical'
-        })
-    
-    df = pd.DataFrame(procedures)
+    procedure_type = rng.choice(procedure_types, n)
+    
+    df = pd.DataFrame({
+        'procedure_id': _ids(n),
+        'procedure_name': rng.choice(_PROCEDURE_NAMES, n),
+        'procedure_type': pd.Categorical(procedure_type, categories=procedure_types),
+        'department': pd.Categorical(rng.choice(_DEPARTMENTS, n), categories=DEPARTMENTS),
+        'avg_duration_minutes': rng.integers(15, 481, n),
+        'base_cost': np.round(rng.uniform(100, 50000, n), 2),
+        'requires_anesthesia': procedure_type == 'Surgical'
+    })
+    
     print(f"[DONE] Generated {len(df)} procedures")
     return df
 
@@ -164,31 +207,43 @@ def generate_diagnoses():
     """Generate diagnosis codes"""
     print(f"Generating diagnoses...")
     df = pd.DataFrame(COMMON_DIAGNOSES)
-    df['diagnosis_id'] = range(1, len(df) + 1)
+    df['diagnosis_id'] = _ids(len(df))
     print(f"[DONE] Generated {len(df)} diagnoses")
     return df
 
-def generate_beds():
+def _build_bed_template():
+    """Build the static bed columns, which depend only on the ward config"""
+    ward_ids = np.repeat(_WARD_IDS, _WARD_CAPACITIES)
+    ward_names = np.repeat(_WARD_NAMES, _WARD_CAPACITIES)
+    bed_nums = np.concatenate([np.arange(1, c + 1) for c in _WARD_CAPACITIES])
+    is_icu = np.char.find(ward_names, 'ICU') >= 0
+    
+    # Bed numbers like "ICU-001": ward prefix plus zero-padded bed number
+    prefixes = np.char.add(np.char.upper(ward_names.astype('U3')), '-')
+    bed_numbers = np.char.add(prefixes, np.char.zfill(bed_nums.astype(str), 3))
+    
+    return {
+        'bed_id': _ids(len(ward_ids)),
+        'ward_id': ward_ids,
+        'bed_number': bed_numbers,
+        'bed_type': pd.Categorical(np.where(is_icu, 'ICU', 'Standard'), categories=['ICU', 'Standard']),
+        'has_ventilator': is_icu,
+        'has_monitor': np.ones(len(ward_ids), dtype=bool),
+    }
+
+_BED_TEMPLATE = _build_bed_template()
+
+def generate_beds(rng=rng):
     """Generate bed inventory"""
     print(f"Generating beds...")
     
-    beds = []
-    bed_id = 1
-    for ward in WARDS:
-        for bed_num in range(1, ward['bed_capacity'] + 1):
-            bed_type = 'ICU' if 'ICU' in ward['ward_name'] else 'Standard'
-            beds.append({
-                'bed_id': bed_id,
-                'ward_id': ward['ward_id'],
-                'bed_number': f"{ward['ward_name'][:3].upper()}-{bed_num:03d}",
-                'bed_type': bed_type,
-                'has_ventilator': bed_type == 'ICU',
-                'has_monitor': True,
-                'is_available': random.choice([True, False])
-            })
-            bed_id += 1
-    
-    df = pd.DataFrame(beds)
+    # Only availability is random; everything else comes from the template
+    n = len(_BED_TEMPLATE['bed_id'])
+    df = pd.DataFrame({
+        **_BED_TEMPLATE,
+        'is_available': rng.integers(0, 2, n).astype(bool)
+    })
+    
     print(f"[DONE] Generated {len(df)} beds")
     return df
 
@@ -200,29 +255,102 @@ def generate_date_dimension(start_date, num_years=NUM_YEARS):
     end = start + pd.DateOffset(years=num_years)
     dates = pd.date_range(start, end, freq='D')
     
+    # Resolve the calendar fields once and derive everything else from them
+    year = dates.year.to_numpy(dtype=np.int16)
+    month = dates.month.to_numpy(dtype=np.int8)
+    day_of_week = dates.dayofweek.to_numpy()
+    
     date_dim = pd.DataFrame({
-        'date_id': range(1, len(dates) + 1),
-        'date': dates,
-        'day': dates.day,
-        'day_of_week': dates.day_name(),
-        'week': dates.isocalendar().week,
-        'month': dates.month,
-        'month_name': dates.month_name(),
-        'quarter': dates.quarter,
-        'year': dates.year,
-        'is_weekend': dates.dayofweek >= 5,
-        'is_holiday': False,  # Simplified
-        'fiscal_year': dates.year
+        'date_id': _ids(len(dates)),
+        'date': _to_date(dates),
+        'day': dates.day.to_numpy(dtype=np.int8),
+        'day_of_week': pd.Categorical(dates.day_name()),
+        'week': dates.isocalendar().week.to_numpy(dtype=np.int8),
+        'month': month,
+        'month_name': pd.Categorical(dates.month_name()),
+        'quarter': (month - 1) // 3 + 1,
+        'year': year,
+        'is_weekend': day_of_week >= 5,
+        'is_holiday': np.zeros(len(dates), dtype=bool),  # Simplified
+        'fiscal_year': year
     })
     
     print(f"[DONE] Generated {len(date_dim)} date records")
     return date_dim
 
+def _run_dimension_generator(task):
+    """Run one dimension generator in a worker with its own seeded RNG streams"""
+    generator, seed_seq = task
+    Faker.seed(int(seed_seq.generate_state(1)[0]))
+    return generator(rng=np.random.default_rng(seed_seq))
+
+def generate_dimensions(seed_seq):
+    """Generate all dimension tables, running the randomized ones in parallel"""
+    generators = {
+        'patients': generate_patients,
+        'staff': generate_staff,
+        'wards': generate_wards,
+        'medications': generate_medications,
+        'procedures': generate_procedures,
+        'beds': generate_beds,
+    }
+    # Independent child seeds keep every table reproducible regardless of scheduling
+    seeds = seed_seq.spawn(len(generators))
+    
+    # Forked workers inherit the initialized Faker instance and value pools
+    # instead of re-importing this module. Only Linux forks: macOS defaults to
+    # spawn because forking after system frameworks load is unsafe, and
+    # Windows has no fork
+    mp_context = None
+    if sys.platform.startswith('linux'):
+        mp_context = multiprocessing.get_context('fork')
+    
+    with ProcessPoolExecutor(mp_context=mp_context) as executor:
+        results = executor.map(_run_dimension_generator, zip(generators.values(), seeds))
+        
+        # Deterministic dimensions are built here while the workers run
+        dimensions = {
+            'diagnoses': generate_diagnoses(),
+            'date': generate_date_dimension(START_DATE),
+        }
+        dimensions.update(zip(generators, results))
+    
+    return dimensions
+
 # ============================================
 # Generate Fact Data
 # ============================================
 
-def generate_admissions(patients_df, wards_df, diagnoses_df, staff_df, beds_df, start_date, num_years=NUM_YEARS):
+def _to_date(datetimes):
+    """Truncate datetime values to an Arrow date column, written as YYYY-MM-DD"""
+    days = np.asarray(datetimes, dtype='datetime64[D]')
+    return pd.array(days, dtype=pd.ArrowDtype(pa.date32()))
+
+# Fact generators size every column exactly up front (via _expand) and build
+# their frames with copy=False, so pandas wraps those arrays instead of
+# copying them into consolidated blocks
+
+def _expand(counts):
+    """Repeat each parent index counts[i] times, with the 0-based position within its parent"""
+    parent = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+    return parent, np.arange(len(parent)) - starts[parent]
+
+def _sample_admissions(admissions_df, frac, rng):
+    """Select a random share of admissions with a boolean mask, keeping admission order"""
+    return admissions_df[rng.random(len(admissions_df)) < frac]
+
+def _distinct_picks(n_rows, k, pool_size, rng):
+    """Draw k distinct indices into a pool for each row, redrawing only rows with repeats"""
+    picks = rng.integers(0, pool_size, (n_rows, k))
+    while True:
+        ordered = np.sort(picks, axis=1)
+        repeats = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+        if not repeats.any():
+            return picks
+        picks[repeats] = rng.integers(0, pool_size, (repeats.sum(), k))
+
+def generate_admissions(patients_df, wards_df, diagnoses_df, doctor_ids, beds_df, start_date, num_years=NUM_YEARS, rng=rng):
     """Generate admission records"""
     print(f"Generating admissions ({num_years} years)...")
     
@@ -232,280 +360,294 @@ def generate_admissions(patients_df, wards_df, diagnoses_df, staff_df, beds_df,
     admission_types = ['Emergency', 'Scheduled', 'Transfer']
     dispositions = ['Home', 'Rehab Facility', 'Nursing Home', 'Expired', 'Transfer', 'Left AMA']
     
-    # Generate 2-5 admissions per patient over 5 years
-    admissions = []
-    admission_id = 1
+    # Generate 2-5 admissions per patient over 5 years, drawn for all patients at once
+    num_admissions = rng.integers(2, 6, len(patients_df))
+    patient_ids = np.repeat(patients_df['patient_id'].to_numpy(), num_admissions)
+    n = len(patient_ids)
+    
+    # Random admission date
+    offset_minutes = (
+        rng.integers(0, (end - start).days + 1, n) * 1440
+        + rng.integers(0, 24, n) * 60
+        + rng.integers(0, 60, n)
+    )
+    admission_datetime = start.to_datetime64() + offset_minutes.astype('timedelta64[m]')
+    
+    # Length of stay varies by severity
+    diag_idx = rng.integers(0, len(diagnoses_df), n)
+    severity = diagnoses_df['severity_level'].to_numpy()[diag_idx]
+    los = np.select(
+        [severity == 'Critical', severity == 'Serious'],
+        [rng.integers(5, 22, n, dtype=np.int8), rng.integers(3, 15, n, dtype=np.int8)],
+        rng.integers(1, 8, n, dtype=np.int8)
+    )
+    discharge_datetime = admission_datetime + los.astype('timedelta64[D]')
+    
+    # With beds sorted by ward, each ward owns a contiguous block, so a bed is
+    # the block start plus a random offset within the block
+    ward_ids = wards_df['ward_id'].to_numpy(dtype=np.int16)[rng.integers(0, len(wards_df), n)]
+    beds_by_ward = beds_df.sort_values('ward_id', kind='stable')
+    bed_ward_ids = beds_by_ward['ward_id'].to_numpy()
+    block_starts = np.searchsorted(bed_ward_ids, ward_ids, side='left')
+    block_sizes = np.searchsorted(bed_ward_ids, ward_ids, side='right') - block_starts
+    bed_offsets = (rng.random(n) * block_sizes).astype(np.int64)
+    bed_ids = beds_by_ward['bed_id'].to_numpy()[block_starts + bed_offsets]
+    
+    diagnosis_ids = diagnoses_df['diagnosis_id'].to_numpy()
+    
+    # 0-2 secondary diagnoses: draw two distinct diagnoses per admission up
+    # front and keep the first k of them
+    first = rng.integers(0, len(diagnosis_ids), n)
+    second = (first + rng.integers(1, len(diagnosis_ids), n)) % len(diagnosis_ids)
+    first_str = diagnosis_ids[first].astype(str)
+    second_str = diagnosis_ids[second].astype(str)
+    num_secondary = rng.integers(0, 3, n)
+    secondary_diagnosis_ids = np.where(
+        num_secondary == 2, np.char.add(np.char.add(first_str, ','), second_str),
+        np.where(num_secondary == 1, first_str, None)
+    )  # null when there are none, so the Bronze field stays empty
+    
+    df = pd.DataFrame({
+        'admission_id': _ids(n),
+        'patient_id': patient_ids,
+        'ward_id': ward_ids,
+        'bed_id': bed_ids,
+        'admission_date': _to_date(admission_datetime),
+        'admission_datetime': admission_datetime,
+        'discharge_date': _to_date(discharge_datetime),
+        'discharge_datetime': discharge_datetime,
+        'admission_type': pd.Categorical(rng.choice(admission_types, n), categories=admission_types),
+        'chief_complaint': pd.Categorical(diagnoses_df['diagnosis_name'].to_numpy()[diag_idx]),
+        'primary_diagnosis_id': diagnosis_ids[diag_idx],
+        'secondary_diagnosis_ids': secondary_diagnosis_ids,
+        'attending_doctor_id': rng.choice(doctor_ids, n),
+        'length_of_stay': los,
+        'is_readmission': False,
+        'readmission_days_since_discharge': None,
+        'discharge_disposition': pd.Categorical(rng.choice(dispositions, n), categories=dispositions),
+        'total_charges': np.round(rng.uniform(5000, 150000, n), 2)
+    }, copy=False)
+    
+    # Order each patient's admissions chronologically and number them in that
+    # order, so readmission can be checked against the previous discharge
+    df = df.sort_values(['patient_id', 'admission_datetime'], kind='stable', ignore_index=True)
+    df['admission_id'] = _ids(n)
+    
+    # Check for readmission
+    prev_discharge = df.groupby('patient_id')['discharge_datetime'].shift()
+    days_since = ((df['admission_datetime'] - prev_discharge) // pd.Timedelta(days=1)).astype('Int32')
+    is_readmission = days_since.between(0, 30).fillna(False).to_numpy(dtype=bool)
+    df['is_readmission'] = is_readmission
+    df['readmission_days_since_discharge'] = days_since.where(is_readmission)
     
-    for _, patient in patients_df.iterrows():
-        num_admissions = random.randint(2, 5)
-        
-        for adm_num in range(num_admissions):
-            # Random admission date
-            days_offset = random.randint(0, (end - start).days)
-            admission_datetime = start + timedelta(days=days_offset, hours=random.randint(0, 23), minutes=random.randint(0, 59))
-            
-            # Length of stay varies by severity
-            diagnosis = diagnoses_df.sample(1).iloc[0]
-            if diagnosis['severity_level'] == 'Critical':
-                los = random.randint(5, 21)
-            elif diagnosis['severity_level'] == 'Serious':
-                los = random.randint(3, 14)
-            else:
-                los = random.randint(1, 7)
-            
-            discharge_datetime = admission_datetime + timedelta(days=los)
-            
-            # Check for readmission
-            is_readmission = False
-            if adm_num > 0:
-                prev_discharge = admissions[admission_id - 2]['discharge_datetime']
-                days_since = (admission_datetime - prev_discharge).days
-                if days_since <= 30:
-                    is_readmission = True
-            
-            ward = wards_df.sample(1).iloc[0]
-            bed = beds_df[beds_df['ward_id'] == ward['ward_id']].sample(1).iloc[0]
-            doctor = staff_df[staff_df['role'].isin(['Attending Physician', 'Resident'])].sample(1).iloc[0]
-            
-            admission = {
-                'admission_id': admission_id,
-                'patient_id': patient['patient_id'],
-                'ward_id': ward['ward_id'],
-                'bed_id': bed['bed_id'],
-                'admission_date': admission_datetime.date(),
-                'admission_datetime': admission_datetime,
-                'discharge_date': discharge_datetime.date(),
-                'discharge_datetime': discharge_datetime,
-                'admission_type': random.choice(admission_types),
-                'chief_complaint': diagnosis['diagnosis_name'],
-                'primary_diagnosis_id': diagnosis['diagnosis_id'],
-                'secondary_diagnosis_ids': ','.join(map(str, diagnoses_df.sample(random.randint(0, 2))['diagnosis_id'].tolist())),
-                'attending_doctor_id': doctor['staff_id'],
-                'length_of_stay': los,
-                'is_readmission': is_readmission,
-                'readmission_days_since_discharge': None,
-                'discharge_disposition': random.choice(dispositions),
-                'total_charges': round(random.uniform(5000, 150000), 2)
-            }
-            admissions.append(admission)
-            admission_id += 1
-    
-    df = pd.DataFrame(admissions)
     print(f"[DONE] Generated {len(df)} admissions")
     return df
 
-def generate_medication_administration(admissions_df, medications_df, staff_df):
+def generate_medication_administration(admissions_df, medications_df, doctor_ids, nurse_ids, rng=rng):
     """Generate medication administration records (MAR)"""
     print(f"Generating medication administration records...")
     
     routes = ['PO', 'IV', 'IM', 'SC', 'Topical', 'Inhaled']
     statuses = ['Given', 'Given', 'Given', 'Given', 'Given', 'Missed', 'Refused', 'Held']  # Weighted toward "Given"
-    
-    mar_records = []
-    mar_id = 1
+    reasons_not_given = {'Missed': 'Patient asleep', 'Refused': 'Patient refused', 'Held': 'Low BP'}
     
     # Sample 30% of admissions for performance
-    sampled_admissions = admissions_df.sample(frac=0.3)
+    sampled_admissions = _sample_admissions(admissions_df, 0.3, rng)
+    admission_ids = sampled_admissions['admission_id'].to_numpy()
+    patient_ids = sampled_admissions['patient_id'].to_numpy()
+    admission_dt = sampled_admissions['admission_datetime'].to_numpy()
+    los = sampled_admissions['length_of_stay'].to_numpy()
+    
+    # Each patient gets 3-8 distinct scheduled medications: the first k of
+    # eight distinct formulary picks per admission
+    num_meds = rng.integers(3, 9, len(sampled_admissions))
+    med_picks = _distinct_picks(len(sampled_admissions), 8, len(medications_df), rng)
+    med_idx = med_picks[np.arange(8) < num_meds[:, None]]
+    pair_adm = np.repeat(np.arange(len(sampled_admissions)), num_meds)
+    
+    # Expand to one row per medication per day, then 1-4 doses per day
+    pair_of_day, day = _expand(los[pair_adm])
+    day_of_dose, dose = _expand(rng.integers(1, 5, len(pair_of_day)))
+    pair = pair_of_day[day_of_dose]
+    adm = pair_adm[pair]
+    day = day[day_of_dose]
+    n = len(adm)
+    
+    scheduled_dt = admission_dt[adm] + (day * 24 + dose * 8).astype('timedelta64[h]')
+    status = rng.choice(statuses, n)
+    given = status == 'Given'
+    administered_dt = np.where(
+        given,
+        scheduled_dt + rng.integers(-30, 61, n).astype('timedelta64[m]'),
+        np.datetime64('NaT')
+    )
+    dosage = np.char.add(
+        np.char.add(rng.choice([10, 25, 50, 100, 250, 500], n).astype(str), ' '),
+        rng.choice(['mg', 'mcg', 'units'], n)
+    )
+    
+    df = pd.DataFrame({
+        'mar_id': _ids(n),
+        'patient_id': patient_ids[adm],
+        'admission_id': admission_ids[adm],
+        'medication_id': medications_df['medication_id'].to_numpy()[med_idx[pair]],
+        'prescribed_by_staff_id': rng.choice(doctor_ids, n),
+        'administered_by_staff_id': pd.array(rng.choice(nurse_ids, n), dtype='Int32'),
+        'scheduled_datetime': scheduled_dt,
+        'administered_datetime': administered_dt,
+        'dosage': pd.Categorical(dosage),
+        'route': pd.Categorical(rng.choice(routes, n), categories=routes),
+        'status': pd.Categorical(status),
+        'reason_if_not_given': pd.Categorical(pd.Series(status).map(reasons_not_given), categories=list(reasons_not_given.values())),
+        'vital_signs_before': None,
+        'vital_signs_after': None
+    }, copy=False)
+    df.loc[~given, 'administered_by_staff_id'] = pd.NA
     
-    for _, admission in sampled_admissions.iterrows():
-        # Each patient gets 3-8 scheduled medications
-        num_meds = random.randint(3, 8)
-        meds = medications_df.sample(num_meds)
-        
-        for _, med in meds.iterrows():
-            # Generate doses for each day of admission
-            for day in range(admission['length_of_stay']):
-                # Medication schedule (1-4 times per day)
-                doses_per_day = random.randint(1, 4)
-                
-                for dose in range(doses_per_day):
-                    scheduled_dt = admission['admission_datetime'] + timedelta(days=day, hours=8*dose)
-                    status = random.choice(statuses)
-                    
-                    if status == 'Given':
-                        administered_dt = scheduled_dt + timedelta(minutes=random.randint(-30, 60))
-                    else:
-                        administered_dt = None
-                    
-                    prescriber = staff_df[staff_df['role'].isin(['Attending Physician', 'Resident'])].sample(1).iloc[0]
-                    nurse = staff_df[staff_df['role'] == 'Registered Nurse'].sample(1).iloc[0]
-                    
-                    mar_records.append({
-                        'mar_id': mar_id,
-                        'patient_id': admission['patient_id'],
-                        'admission_id': admission['admission_id'],
-                        'medication_id': med['medication_id'],
-                        'prescribed_by_staff_id': prescriber['staff_id'],
-                        'administered_by_staff_id': nurse['staff_id'] if status == 'Given' else None,
-                        'scheduled_datetime': scheduled_dt,
-                        'administered_datetime': administered_dt,
-                        'dosage': f"{random.choice([10, 25, 50, 100, 250, 500])} {random.choice(['mg', 'mcg', 'units'])}",
-                        'route': random.choice(routes),
-                        'status': status,
-                        'reason_if_not_given': 'Patient asleep' if status == 'Missed' else ('Patient refused' if status == 'Refused' else ('Low BP' if status == 'Held' else None)),
-                        'vital_signs_before': None,
-                        'vital_signs_after': None
-                    })
-                    mar_id += 1
-    
-    df = pd.DataFrame(mar_records)
     print(f"[DONE] Generated {len(df)} medication administration records")
     return df
 
-def generate_vital_signs(admissions_df, staff_df):
+def generate_vital_signs(admissions_df, nurse_ids, rng=rng):
     """Generate vital signs measurements"""
     print(f"Generating vital signs...")
     
-    vitals = []
-    vital_id = 1
-    
     # Sample 30% of admissions
-    sampled_admissions = admissions_df.sample(frac=0.3)
+    sampled_admissions = _sample_admissions(admissions_df, 0.3, rng)
+    
+    # Vital signs checked 2-4 times per day, one row per check over the stay
+    checks_per_day = rng.integers(2, 5, len(sampled_admissions))
+    adm, position = _expand(sampled_admissions['length_of_stay'].to_numpy() * checks_per_day)
+    day, check = np.divmod(position, checks_per_day[adm])
+    n = len(adm)
+    
+    recorded_dt = sampled_admissions['admission_datetime'].to_numpy()[adm] + (day * 24 + check * 6).astype('timedelta64[h]')
+    
+    df = pd.DataFrame({
+        'vital_id': _ids(n),
+        'patient_id': sampled_admissions['patient_id'].to_numpy()[adm],
+        'admission_id': sampled_admissions['admission_id'].to_numpy()[adm],
+        'recorded_datetime': recorded_dt,
+        'recorded_by_staff_id': rng.choice(nurse_ids, n),
+        'blood_pressure_systolic': rng.integers(90, 181, n, dtype=np.int16),
+        'blood_pressure_diastolic': rng.integers(60, 121, n, dtype=np.int16),
+        'heart_rate': rng.integers(55, 121, n, dtype=np.int16),
+        'temperature': np.round(rng.uniform(36.0, 39.0, n), 1).astype(np.float32),
+        'respiratory_rate': rng.integers(12, 25, n, dtype=np.int8),
+        'oxygen_saturation': rng.integers(88, 101, n, dtype=np.int8),
+        'pain_level': rng.integers(0, 9, n, dtype=np.int8),
+        'consciousness_level': pd.Categorical(rng.choice(['Alert', 'Alert', 'Alert', 'Confused', 'Lethargic'], n))
+    }, copy=False)
     
-    for _, admission in sampled_admissions.iterrows():
-        # Vital signs checked 2-4 times per day
-        checks_per_day = random.randint(2, 4)
-        
-        for day in range(admission['length_of_stay']):
-            for check in range(checks_per_day):
-                recorded_dt = admission['admission_datetime'] + timedelta(days=day, hours=6*check)
-                nurse = staff_df[staff_df['role'] == 'Registered Nurse'].sample(1).iloc[0]
-                
-                vitals.append({
-                    'vital_id': vital_id,
-                    'patient_id': admission['patient_id'],
-                    'admission_id': admission['admission_id'],
-                    'recorded_datetime': recorded_dt,
-                    'recorded_by_staff_id': nurse['staff_id'],
-                    'blood_pressure_systolic': random.randint(90, 180),
-                    'blood_pressure_diastolic': random.randint(60, 120),
-                    'heart_rate': random.randint(55, 120),
-                    'temperature': round(random.uniform(36.0, 39.0), 1),
-                    'respiratory_rate': random.randint(12, 24),
-                    'oxygen_saturation': random.randint(88, 100),
-                    'pain_level': random.randint(0, 8),
-                    'consciousness_level': random.choice(['Alert', 'Alert', 'Alert', 'Confused', 'Lethargic'])
-                })
-                vital_id += 1
-    
-    df = pd.DataFrame(vitals)
     print(f"[DONE] Generated {len(df)} vital signs records")
     return df
 
-def generate_daily_activities(admissions_df, staff_df):
+def generate_daily_activities(admissions_df, nurse_ids, rng=rng):
     """Generate daily activity logs (ADL)"""
     print(f"Generating daily activity logs...")
     
     mental_statuses = ['Alert', 'Alert', 'Confused', 'Lethargic', 'Agitated']
     moods = ['Cooperative', 'Cooperative', 'Anxious', 'Depressed', 'Irritable']
     
-    activities = []
-    activity_id = 1
+    # Comments array for variation
+    possible_comments = [
+        "Patient ambulated to hallway with walker, good progress today.",
+        "Patient complained of pain in right hip during PT session.",
+        "Family visited today, patient mood improved significantly.",
+        "Patient required extensive assistance with morning hygiene.",
+        "Good appetite today, finished most meals independently.",
+        "Patient expressed desire to go home, education provided.",
+        "Wound dressing changed, healing well per nursing assessment.",
+        "Patient participated in physical therapy exercises reluctantly.",
+        "Overnight sleep interrupted 3x for medications/vitals.",
+        "Patient displayed confusion this morning, resolved by afternoon.",
+        "No bowel movement for 2 days, physician notified.",
+        "Patient tolerated ambulation better today vs yesterday.",
+    ]
     
     # Sample 40% of admissions
-    sampled_admissions = admissions_df.sample(frac=0.4)
+    sampled_admissions = _sample_admissions(admissions_df, 0.4, rng)
+    
+    # One activity log per day of each sampled admission
+    adm, day = _expand(sampled_admissions['length_of_stay'].to_numpy())
+    n = len(adm)
+    activity_dt = sampled_admissions['admission_datetime'].to_numpy()[adm] + day.astype('timedelta64[D]')
+    
+    df = pd.DataFrame({
+        'activity_id': _ids(n),
+        'patient_id': sampled_admissions['patient_id'].to_numpy()[adm],
+        'admission_id': sampled_admissions['admission_id'].to_numpy()[adm],
+        'activity_date': _to_date(activity_dt),
+        'recorded_by_staff_id': rng.choice(nurse_ids, n),
+        'recorded_datetime': activity_dt + np.timedelta64(20, 'h'),
+        'mobility_score': rng.integers(1, 6, n, dtype=np.int8),
+        'mobility_notes': pd.Categorical(rng.choice(['Walked to chair (assisted)', 'Bedbound', 'Walked hallway with walker', 'Independent ambulation'], n)),
+        'self_care_score': rng.integers(1, 6, n, dtype=np.int8),
+        'breakfast_percent_consumed': rng.integers(25, 101, n, dtype=np.int8),
+        'lunch_percent_consumed': rng.integers(25, 101, n, dtype=np.int8),
+        'dinner_percent_consumed': rng.integers(25, 101, n, dtype=np.int8),
+        'feeding_assistance_needed': rng.choice([True, False], n),
+        'bathroom_independence': rng.choice([True, True, False], n),
+        'continent_bladder': rng.choice([True, True, True, False], n),
+        'continent_bowel': rng.choice([True, True, True, False], n),
+        'output_notes': pd.Categorical(rng.choice(['Urination normal', 'No BM today', 'Catheter in place', 'Normal output'], n)),
+        'mental_status': pd.Categorical(rng.choice(mental_statuses, n)),
+        'mood': pd.Categorical(rng.choice(moods, n)),
+        'pain_level': rng.integers(0, 8, n, dtype=np.int8),
+        'pain_location': pd.Categorical(rng.choice(['None', 'Abdomen', 'Hip', 'Chest', 'Back', 'Head'], n)),
+        'pain_management_effectiveness': rng.integers(1, 6, n, dtype=np.int8),
+        'sleep_quality': rng.integers(2, 6, n, dtype=np.int8),
+        'sleep_hours': np.round(rng.uniform(4.0, 9.0, n), 1).astype(np.float32),
+        'comments': pd.Categorical.from_codes(
+            np.where(rng.random(n) > 0.3, rng.integers(0, len(possible_comments), n), -1),  # 70% have comments
+            categories=possible_comments
+        )
+    }, copy=False)
     
-    for _, admission in sampled_admissions.iterrows():
-        for day in range(admission['length_of_stay']):
-            activity_date = (admission['admission_datetime'] + timedelta(days=day)).date()
-            nurse = staff_df[staff_df['role'] == 'Registered Nurse'].sample(1).iloc[0]
-            
-            # Comments array for variation
-            possible_comments = [
-                "Patient ambulated to hallway with walker, good progress today.",
-                "Patient complained of pain in right hip during PT session.",
-                "Family visited today, patient mood improved significantly.",
-                "Patient required extensive assistance with morning hygiene.",
-                "Good appetite today, finished most meals independently.",
-                "Patient expressed desire to go home, education provided.",
-                "Wound dressing changed, healing well per nursing assessment.",
-                "Patient participated in physical therapy exercises reluctantly.",
-                "Overnight sleep interrupted 3x for medications/vitals.",
-                "Patient displayed confusion this morning, resolved by afternoon.",
-                "No bowel movement for 2 days, physician notified.",
-                "Patient tolerated ambulation better today vs yesterday.",
-            ]
-            
-            activities.append({
-                'activity_id': activity_id,
-                'patient_id': admission['patient_id'],
-                'admission_id': admission['admission_id'],
-                'activity_date': activity_date,
-                'recorded_by_staff_id': nurse['staff_id'],
-                'recorded_datetime': admission['admission_datetime'] + timedelta(days=day, hours=20),
-                'mobility_score': random.randint(1, 5),
-                'mobility_notes': random.choice(['Walked to chair (assisted)', 'Bedbound', 'Walked hallway with walker', 'Independent ambulation']),
-                'self_care_score': random.randint(1, 5),
-                'breakfast_percent_consumed': random.randint(25, 100),
-                'lunch_percent_consumed': random.randint(25, 100),
-                'dinner_percent_consumed': random.randint(25, 100),
-                'feeding_assistance_needed': random.choice([True, False]),
-                'bathroom_independence': random.choice([True, True, False]),
-                'continent_bladder': random.choice([True, True, True, False]),
-                'continent_bowel': random.choice([True, True, True, False]),
-                'output_notes': random.choice(['Urination normal', 'No BM today', 'Catheter in place', 'Normal output']),
-                'mental_status': random.choice(mental_statuses),
-                'mood': random.choice(moods),
-                'pain_level': random.randint(0, 7),
-                'pain_location': random.choice(['None', 'Abdomen', 'Hip', 'Chest', 'Back', 'Head']),
-                'pain_management_effectiveness': random.randint(1, 5),
-                'sleep_quality': random.randint(2, 5),
-                'sleep_hours': round(random.uniform(4.0, 9.0), 1),
-                'comments': random.choice(possible_comments) if random.random() > 0.3 else None  # 70% have comments
-            })
-            activity_id += 1
-    
-    df = pd.DataFrame(activities)
     print(f"[DONE] Generated {len(df)} daily activity records")
     return df
 
-def generate_procedure_events(admissions_df, procedures_df, staff_df):
+def generate_procedure_events(admissions_df, procedures_df, doctor_ids, rng=rng):
     """Generate procedure events"""
     print(f"Generating procedure events...")
     
     outcomes = ['Successful', 'Successful', 'Successful', 'Complicated', 'Aborted']
     
-    procedure_events = []
-    event_id = 1
-    
-    # 40% of admissions have procedures
-    admissions_with_procedures = admissions_df.sample(frac=0.4)
+    # 40% of admissions have procedures, 1-3 each
+    admissions_with_procedures = _sample_admissions(admissions_df, 0.4, rng)
+    adm, _ = _expand(rng.integers(1, 4, len(admissions_with_procedures)))
+    n = len(adm)
+    
+    proc = rng.integers(0, len(procedures_df), n)
+    los = admissions_with_procedures['length_of_stay'].to_numpy()[adm]
+    scheduled_dt = (
+        admissions_with_procedures['admission_datetime'].to_numpy()[adm]
+        + (rng.integers(0, los) * 24 + rng.integers(8, 18, n)).astype('timedelta64[h]')
+    )
+    actual_dt = scheduled_dt + rng.integers(-30, 121, n).astype('timedelta64[m]')
+    
+    df = pd.DataFrame({
+        'procedure_event_id': _ids(n),
+        'patient_id': admissions_with_procedures['patient_id'].to_numpy()[adm],
+        'admission_id': admissions_with_procedures['admission_id'].to_numpy()[adm],
+        'procedure_id': procedures_df['procedure_id'].to_numpy()[proc],
+        'performed_by_staff_id': rng.choice(doctor_ids, n),
+        'scheduled_datetime': scheduled_dt,
+        'actual_datetime': actual_dt,
+        'duration_minutes': procedures_df['avg_duration_minutes'].to_numpy()[proc] + rng.integers(-30, 61, n),
+        'outcome': pd.Categorical(rng.choice(outcomes, n)),
+        'complications': pd.Categorical(np.where(rng.random(n) > 0.9, 'Minor bleeding', None)),
+        'notes': 'Procedure completed as planned',
+        'procedure_charges': procedures_df['base_cost'].to_numpy()[proc]
+    }, copy=False)
     
-    for _, admission in admissions_with_procedures.iterrows():
-        num_procedures = random.randint(1, 3)
-        
-        for proc_num in range(num_procedures):
-            procedure = procedures_df.sample(1).iloc[0]
-            doctor = staff_df[staff_df['role'].isin(['Attending Physician', 'Resident'])].sample(1).iloc[0]
-            
-            scheduled_dt = admission['admission_datetime'] + timedelta(days=random.randint(0, admission['length_of_stay']-1), hours=random.randint(8, 17))
-            actual_dt = scheduled_dt + timedelta(minutes=random.randint(-30, 120))
-            
-            procedure_events.append({
-                'procedure_event_id': event_id,
-                'patient_id': admission['patient_id'],
-                'admission_id': admission['admission_id'],
-                'procedure_id': procedure['procedure_id'],
-                'performed_by_staff_id': doctor['staff_id'],
-                'scheduled_datetime': scheduled_dt,
-                'actual_datetime': actual_dt,
-                'duration_minutes': procedure['avg_duration_minutes'] + random.randint(-30, 60),
-                'outcome': random.choice(outcomes),
-                'complications': 'Minor bleeding' if random.random() > 0.9 else None,
-                'notes': 'Procedure completed as planned',
-                'procedure_charges': procedure['base_cost']
-            })
-            event_id += 1
-    
-    df = pd.DataFrame(procedure_events)
     print(f"[DONE] Generated {len(df)} procedure events")
     return df
 
-def generate_lab_results(admissions_df, staff_df):
+def generate_lab_results(admissions_df, doctor_ids, rng=rng):
     """Generate lab test results"""
     print(f"Generating lab results...")
     
-    test_types = [
+    test_types = pd.DataFrame([
         ('CBC', 'Hemoglobin', '12-16 g/dL', 'g/dL'),
         ('CBC', 'WBC Count', '4-11 K/uL', 'K/uL'),
         ('BMP', 'Sodium', '135-145 mEq/L', 'mEq/L'),
@@ -514,52 +656,47 @@ def generate_lab_results(admissions_df, staff_df):
         ('Lipid Panel', 'Total Cholesterol', '<200 mg/dL', 'mg/dL'),
         ('Lipid Panel', 'HDL', '>40 mg/dL', 'mg/dL'),
         ('Liver Function', 'ALT', '7-56 U/L', 'U/L'),
-    ]
+    ], columns=['test_type', 'test_name', 'reference_range', 'unit_of_measure']).astype('category')
     
     abnormal_flags = ['Normal', 'Normal', 'Normal', 'High', 'Low', 'Critical']
     
-    labs = []
-    lab_id = 1
-    
-    # 50% of admissions have labs
-    admissions_with_labs = admissions_df.sample(frac=0.5)
+    # 50% of admissions have labs, 1-4 panels each
+    admissions_with_labs = _sample_admissions(admissions_df, 0.5, rng)
+    adm, _ = _expand(rng.integers(1, 5, len(admissions_with_labs)))
+    n = len(adm)
+    
+    test = test_types.iloc[rng.integers(0, len(test_types), n)].reset_index(drop=True)
+    los = admissions_with_labs['length_of_stay'].to_numpy()[adm]
+    collected_dt = (
+        admissions_with_labs['admission_datetime'].to_numpy()[adm]
+        + (rng.integers(0, los) * 24 + rng.integers(6, 11, n)).astype('timedelta64[h]')
+    )
+    resulted_dt = collected_dt + rng.integers(2, 25, n).astype('timedelta64[h]')
+    
+    df = pd.DataFrame({
+        'lab_id': _ids(n),
+        'patient_id': admissions_with_labs['patient_id'].to_numpy()[adm],
+        'admission_id': admissions_with_labs['admission_id'].to_numpy()[adm],
+        'test_type': test['test_type'],
+        'test_name': test['test_name'],
+        'ordered_by_staff_id': rng.choice(doctor_ids, n),
+        'collected_datetime': collected_dt,
+        'resulted_datetime': resulted_dt,
+        'test_value': np.round(rng.uniform(50, 200, n), 1).astype(str),
+        'unit_of_measure': test['unit_of_measure'],
+        'reference_range': test['reference_range'],
+        'abnormal_flag': pd.Categorical(rng.choice(abnormal_flags, n)),
+        'lab_department': 'Clinical Lab'
+    }, copy=False)
     
-    for _, admission in admissions_with_labs.iterrows():
-        num_lab_panels = random.randint(1, 4)
-        
-        for _ in range(num_lab_panels):
-            test = random.choice(test_types)
-            doctor = staff_df[staff_df['role'].isin(['Attending Physician', 'Resident'])].sample(1).iloc[0]
-            
-            collected_dt = admission['admission_datetime'] + timedelta(days=random.randint(0, admission['length_of_stay']-1), hours=random.randint(6, 10))
-            resulted_dt = collected_dt + timedelta(hours=random.randint(2, 24))
-            
-            labs.append({
-                'lab_id': lab_id,
-                'patient_id': admission['patient_id'],
-                'admission_id': admission['admission_id'],
-                'test_type': test[0],
-                'test_name': test[1],
-                'ordered_by_staff_id': doctor['staff_id'],
-                'collected_datetime': collected_dt,
-                'resulted_datetime': resulted_dt,
-                'test_value': str(round(random.uniform(50, 200), 1)),
-                'unit_of_measure': test[3],
-                'reference_range': test[2],
-                'abnormal_flag': random.choice(abnormal_flags),
-                'lab_department': 'Clinical Lab'
-            })
-            lab_id += 1
-    
-    df = pd.DataFrame(labs)
     print(f"[DONE] Generated {len(df)} lab results")
     return df
 
-def generate_care_plan_goals(admissions_df, staff_df):
+def generate_care_plan_goals(admissions_df, nurse_ids, rng=rng):
     """Generate care plan goals"""
     print(f"Generating care plan goals...")
     
-    goal_templates = [
+    goal_templates = pd.DataFrame([
         ('Mobility', 'Walk 50 feet independently by discharge'),
         ('Mobility', 'Transfer from bed to chair with minimal assistance'),
         ('Pain Management', 'Maintain pain level below 4/10'),
@@ -567,50 +704,113 @@ def generate_care_plan_goals(admissions_df, staff_df):
         ('Self-Care', 'Complete morning hygiene independently'),
         ('Nutrition', 'Consume 75% of meals without assistance'),
         ('Education', 'Patient verbalizes understanding of discharge medications'),
-    ]
+    ], columns=['goal_type', 'goal_description']).astype('category')
     
     statuses = ['Not Started', 'In Progress', 'In Progress', 'In Progress', 'Achieved', 'Discontinued']
     
-    goals = []
-    goal_id = 1
+    # 60% of admissions have care plan goals, 2-4 each
+    admissions_with_goals = _sample_admissions(admissions_df, 0.6, rng)
+    adm, _ = _expand(rng.integers(2, 5, len(admissions_with_goals)))
+    n = len(adm)
+    
+    goal = goal_templates.iloc[rng.integers(0, len(goal_templates), n)].reset_index(drop=True)
+    status = rng.choice(statuses, n)
+    progress = np.select(
+        [status == 'Achieved', status == 'In Progress'],
+        [np.int8(100), rng.integers(30, 91, n, dtype=np.int8)],
+        np.int8(0)
+    )
+    admission_dt = admissions_with_goals['admission_datetime'].to_numpy()[adm]
+    los = admissions_with_goals['length_of_stay'].to_numpy()[adm]
+    
+    df = pd.DataFrame({
+        'goal_id': _ids(n),
+        'patient_id': admissions_with_goals['patient_id'].to_numpy()[adm],
+        'admission_id': admissions_with_goals['admission_id'].to_numpy()[adm],
+        'goal_type': goal['goal_type'],
+        'goal_description': goal['goal_description'],
+        'target_date': admissions_with_goals['discharge_date'].array[adm],
+        'status': pd.Categorical(status),
+        'progress_pct': progress,
+        'created_by_staff_id': rng.choice(nurse_ids, n),
+        'created_datetime': admission_dt + rng.integers(2, 25, n).astype('timedelta64[h]'),
+        'last_updated_datetime': admission_dt + rng.integers(1, los + 1).astype('timedelta64[D]')
+    }, copy=False)
     
-    # 60% of admissions have care plan goals
-    admissions_with_goals = admissions_df.sample(frac=0.6)
-    
-    for _, admission in admissions_with_goals.iterrows():
-        num_goals = random.randint(2, 4)
-        
-        for _ in range(num_goals):
-            goal_template = random.choice(goal_templates)
-            nurse = staff_df[staff_df['role'] == 'Registered Nurse'].sample(1).iloc[0]
-            
-            status = random.choice(statuses)
-            if status == 'Achieved':
-                progress = 100
-            elif status == 'In Progress':
-                progress = random.randint(30, 90)
-            else:
-                progress = 0
-            
-            goals.append({
-                'goal_id': goal_id,
-                'patient_id': admission['patient_id'],
-                'admission_id': admission['admission_id'],
-                'goal_type': goal_template[0],
-                'goal_description': goal_template[1],
-                'target_date': admission['discharge_date'],
-                'status': status,
-                'progress_pct': progress,
-                'created_by_staff_id': nurse['staff_id'],
-                'created_datetime': admission['admission_datetime'] + timedelta(hours=random.randint(2, 24)),
-                'last_updated_datetime': admission['admission_datetime'] + timedelta(days=random.randint(1, admission['length_of_stay']))
-            })
-            goal_id += 1
-    
-    df = pd.DataFrame(goals)
     print(f"[DONE] Generated {len(df)} care plan goals")
     return df
 
+# ============================================
+# Output
+# ============================================
+
+BRONZE_BATCH_ROWS = 50_000
+FACT_CHUNK_ADMISSIONS = 20_000
+
+def iter_fact_chunks(generate, admissions_df, *args, chunk_size=FACT_CHUNK_ADMISSIONS, **kwargs):
+    """Run a fact generator over consecutive slices of admissions, keeping ids sequential across slices"""
+    next_id = 1
+    for start in range(0, len(admissions_df), chunk_size):
+        chunk = generate(admissions_df.iloc[start:start + chunk_size], *args, **kwargs)
+        id_column = chunk.columns[0]
+        chunk[id_column] += next_id - 1
+        next_id += len(chunk)
+        yield chunk
+
+# Bronze CSV format: strings are always quoted (quoting_style='needed'; an
+# unquoted style fails on values containing commas or newlines), booleans are
+# written true/false, nulls as empty unquoted fields, and timestamps as
+# YYYY-MM-DD HH:MM:SS. The warehouse stage file formats must accept quoted fields
+BRONZE_CSV_OPTIONS = pa_csv.WriteOptions(quoting_style='needed')
+
+def _bronze_schema(df, filepath):
+    """Arrow schema for a Bronze file; CSV timestamps are written at second precision"""
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    if filepath.suffix == '.parquet':
+        return schema
+    return pa.schema([
+        field.with_type(pa.timestamp('s')) if pa.types.is_timestamp(field.type) else field
+        for field in schema
+    ])
+
+def _open_bronze_writer(filepath, schema):
+    """Open a record batch writer for a Bronze file, Parquet or CSV by file suffix"""
+    if filepath.suffix == '.parquet':
+        return pq.ParquetWriter(filepath, schema, compression='snappy')
+    return pa_csv.CSVWriter(filepath, schema, write_options=BRONZE_CSV_OPTIONS)
+
+def save_bronze_chunks(chunks, filepath, batch_rows=BRONZE_BATCH_ROWS):
+    """Stream DataFrame chunks to a Bronze file in record batches; returns the row count"""
+    writer = None
+    empty_schema = None
+    rows = 0
+    try:
+        for chunk in chunks:
+            if chunk.empty:
+                # Empty chunks can't tell string columns from all-null ones, so
+                # they only provide a fallback schema for a header-only file
+                empty_schema = empty_schema or _bronze_schema(chunk, filepath)
+                continue
+            if writer is None:
+                schema = _bronze_schema(chunk, filepath)
+                writer = _open_bronze_writer(filepath, schema)
+            
+            for start in range(0, len(chunk), batch_rows):
+                batch = chunk.iloc[start:start + batch_rows]
+                writer.write_batch(pa.RecordBatch.from_pandas(batch, schema=schema, preserve_index=False))
+            rows += len(chunk)
+        
+        if writer is None and empty_schema is not None:
+            writer = _open_bronze_writer(filepath, empty_schema)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+def save_bronze_table(df, filepath, batch_rows=BRONZE_BATCH_ROWS):
+    """Stream a DataFrame to CSV or Parquet in record batches so only one batch is converted at a time"""
+    return save_bronze_chunks([df], filepath, batch_rows)
+
 # ============================================
 # Main Execution
 # ============================================
@@ -618,28 +818,44 @@ def generate_care_plan_goals(admissions_df, staff_df):
 def main():
     print("\nStarting data generation process...")
     print(f"Output directory: {RAW_DATA_DIR}\n")
+    ensure_data_dirs()
+    
+    # Every table draws from its own child seed, so each one is reproducible on
+    # its own and the fact generators can be reordered or run in parallel
+    dimension_seed, fact_seed = np.random.SeedSequence(42).spawn(2)
+    fact_rngs = dict(zip(
+        ['admissions', 'medication_administration', 'vital_signs', 'daily_activities',
+         'procedures', 'lab_results', 'care_plan_goals'],
+        map(np.random.default_rng, fact_seed.spawn(7))
+    ))
     
     # Generate dimensions
-    patients_df = generate_patients()
-    staff_df = generate_staff()
-    wards_df = generate_wards()
-    medications_df = generate_medications()
-    procedures_df = generate_procedures()
-    diagnoses_df = generate_diagnoses()
-    beds_df = generate_beds()
-    date_df = generate_date_dimension(START_DATE)
+    dimensions = generate_dimensions(dimension_seed)
+    patients_df = dimensions['patients']
+    staff_df = dimensions['staff']
+    wards_df = dimensions['wards']
+    medications_df = dimensions['medications']
+    procedures_df = dimensions['procedures']
+    diagnoses_df = dimensions['diagnoses']
+    beds_df = dimensions['beds']
+    date_df = dimensions['date']
+    
+    # Staff id pools by role, computed once and shared by the fact generators
+    doctor_ids = staff_df.loc[staff_df['role'].isin(['Attending Physician', 'Resident']), 'staff_id'].to_numpy()
+    nurse_ids = staff_df.loc[staff_df['role'] == 'Registered Nurse', 'staff_id'].to_numpy()
     
     # Generate facts
-    admissions_df = generate_admissions(patients_df, wards_df, diagnoses_df, staff_df, beds_df, START_DATE)
-    mar_df = generate_medication_administration(admissions_df, medications_df, staff_df)
-    vitals_df = generate_vital_signs(admissions_df, staff_df)
-    activities_df = generate_daily_activities(admissions_df, staff_df)
-    procedures_events_df = generate_procedure_events(admissions_df, procedures_df, staff_df)
-    labs_df = generate_lab_results(admissions_df, staff_df)
-    goals_df = generate_care_plan_goals(admissions_df, staff_df)
+    admissions_df = generate_admissions(patients_df, wards_df, diagnoses_df, doctor_ids, beds_df, START_DATE,
+                                        rng=fact_rngs['admissions'])
+    
+    # The downstream facts only need a few admission columns; sample from this narrow view
+    admission_core = admissions_df[['admission_id', 'patient_id', 'admission_datetime', 'discharge_date', 'length_of_stay']]
+    procedures_events_df = generate_procedure_events(admission_core, procedures_df, doctor_ids, rng=fact_rngs['procedures'])
+    labs_df = generate_lab_results(admission_core, doctor_ids, rng=fact_rngs['lab_results'])
+    goals_df = generate_care_plan_goals(admission_core, nurse_ids, rng=fact_rngs['care_plan_goals'])
     
-    # Save to CSV
-    print("\nSaving data to CSV files...")
+    # Save Bronze files
+    print(f"\nSaving data to CSV files (facts as {BRONZE_FACT_FORMAT})...")
     
     datasets = {
         'dim_patients.csv': patients_df,
@@ -651,18 +867,34 @@ def main():
         'dim_beds.csv': beds_df,
         'dim_date.csv': date_df,
         'fact_admissions.csv': admissions_df,
-        'fact_medication_administration.csv': mar_df,
-        'fact_vital_signs.csv': vitals_df,
-        'fact_daily_activities.csv': activities_df,
+        # Per-day facts are the largest tables, so they are generated in
+        # admission chunks while being written instead of held in memory
+        'fact_medication_administration.csv': iter_fact_chunks(
+            generate_medication_administration, admission_core, medications_df, doctor_ids, nurse_ids,
+            rng=fact_rngs['medication_administration']),
+        'fact_vital_signs.csv': iter_fact_chunks(
+            generate_vital_signs, admission_core, nurse_ids, rng=fact_rngs['vital_signs']),
+        'fact_daily_activities.csv': iter_fact_chunks(
+            generate_daily_activities, admission_core, nurse_ids, rng=fact_rngs['daily_activities']),
         'fact_procedures.csv': procedures_events_df,
         'fact_lab_results.csv': labs_df,
         'fact_care_plan_goals.csv': goals_df,
     }
     
-    for filename, df in datasets.items():
+    row_counts = {}
+    for filename, data in datasets.items():
         filepath = RAW_DATA_DIR / filename
-        df.to_csv(filepath, index=False)
-        print(f"  [SAVED] {filename} ({len(df):,} records)")
+        if filename.startswith('fact_'):
+            # Facts can be written as Parquet; remove the file in the other
+            # format so loaders don't pick up a stale copy
+            suffix = '.parquet' if BRONZE_FACT_FORMAT == 'parquet' else '.csv'
+            stale = '.csv' if suffix == '.parquet' else '.parquet'
+            filepath.with_suffix(stale).unlink(missing_ok=True)
+            filepath = filepath.with_suffix(suffix)
+            filename = filepath.name
+        chunks = [data] if isinstance(data, pd.DataFrame) else data
+        row_counts[filepath.stem] = save_bronze_chunks(chunks, filepath)
+        print(f"  [SAVED] {filename} ({row_counts[filepath.stem]:,} records)")
     
     # Summary statistics
     print("\n" + "=" * 60)
@@ -671,9 +903,9 @@ def main():
     print(f"Total Patients: {len(patients_df):,}")
     print(f"Total Staff: {len(staff_df):,}")
     print(f"Total Admissions: {len(admissions_df):,}")
-    print(f"Total Medication Doses: {len(mar_df):,}")
-    print(f"Total Vital Signs: {len(vitals_df):,}")
-    print(f"Total Daily Activities: {len(activities_df):,}")
+    print(f"Total Medication Doses: {row_counts['fact_medication_administration']:,}")
+    print(f"Total Vital Signs: {row_counts['fact_vital_signs']:,}")
+    print(f"Total Daily Activities: {row_counts['fact_daily_activities']:,}")
     print(f"Total Procedures: {len(procedures_events_df):,}")
     print(f"Total Lab Results: {len(labs_df):,}")
     print(f"Total Care Goals: {len(goals_df):,}")
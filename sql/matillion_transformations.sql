@@ -400,6 +400,70 @@ SELECT
 FROM GOLD.FACT_ADMISSIONS
 GROUP BY TO_CHAR(admission_date, 'YYYY-MM');
 
+-- --------------------------------------------------------------
+-- Executive KPIs (single-row snapshot for the Executive Dashboard;
+-- current occupancy depends on CURRENT_DATE and is queried live)
+-- --------------------------------------------------------------
+CREATE OR REPLACE TABLE GOLD.AGG_EXECUTIVE_KPIS AS
+WITH recent_discharges AS (
+    SELECT length_of_stay, is_readmission
+    FROM GOLD.FACT_ADMISSIONS
+    WHERE discharge_date >= (SELECT MAX(discharge_date) FROM GOLD.FACT_ADMISSIONS) - INTERVAL '60 days'
+      AND discharge_date IS NOT NULL
+)
+SELECT
+    (SELECT ROUND(AVG(length_of_stay), 1) FROM recent_discharges) AS avg_los,
+    (SELECT ROUND(COUNT_IF(is_readmission) * 100.0 / COUNT(*), 1)
+     FROM recent_discharges) AS readmission_rate,
+    (SELECT COUNT(*) FROM GOLD.FACT_ADMISSIONS
+     WHERE admission_date = (SELECT MAX(admission_date) FROM GOLD.FACT_ADMISSIONS)) AS today_admissions,
+    CURRENT_TIMESTAMP() AS created_at;
+
+-- --------------------------------------------------------------
+-- Daily Quality Roll-up (for Quality & Outcomes)
+-- --------------------------------------------------------------
+CREATE OR REPLACE TABLE GOLD.AGG_QUALITY_DAILY AS
+SELECT
+    discharge_date,
+    ward_id,
+    primary_diagnosis_id,
+    discharge_disposition,
+    COUNT(*) AS admission_count,
+    COUNT_IF(is_readmission) AS readmissions,
+    COUNT(length_of_stay) AS los_count,
+    SUM(length_of_stay) AS total_los,
+    MIN(length_of_stay) AS min_los,
+    MAX(length_of_stay) AS max_los,
+    SUM(total_charges) AS total_charges,
+    CURRENT_TIMESTAMP() AS created_at
+FROM GOLD.FACT_ADMISSIONS
+WHERE discharge_date IS NOT NULL
+GROUP BY discharge_date, ward_id, primary_diagnosis_id, discharge_disposition
+ORDER BY discharge_date;
+
+-- --------------------------------------------------------------
+-- Daily Admissions Roll-up (for the Executive Dashboard)
+-- --------------------------------------------------------------
+CREATE OR REPLACE TABLE GOLD.AGG_ADMISSIONS_DAILY AS
+SELECT
+    admission_date,
+    ward_id,
+    primary_diagnosis_id,
+    COUNT(*) AS admission_count,
+    CURRENT_TIMESTAMP() AS created_at
+FROM GOLD.FACT_ADMISSIONS
+GROUP BY admission_date, ward_id, primary_diagnosis_id
+ORDER BY admission_date;
+
+-- --------------------------------------------------------------
+-- Medication Data Clock (latest scheduled dose, for Medication Analytics)
+-- --------------------------------------------------------------
+CREATE OR REPLACE TABLE GOLD.AGG_MEDICATION_CLOCK AS
+SELECT
+    MAX(scheduled_datetime) AS max_scheduled_datetime,
+    CURRENT_TIMESTAMP() AS created_at
+FROM GOLD.FACT_MEDICATION_ADMINISTRATION;
+
 -- ==================================================================
 -- DATA QUALITY CHECKS
 -- ==================================================================
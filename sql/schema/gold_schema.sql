@@ -328,6 +328,41 @@ CREATE TABLE IF NOT EXISTS agg_monthly_kpis (
     PRIMARY KEY (year_month)
 );
 
+CREATE TABLE IF NOT EXISTS agg_executive_kpis (
+    avg_los DECIMAL(5, 1),
+    readmission_rate DECIMAL(5, 1),
+    today_admissions INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS agg_quality_daily (
+    discharge_date DATE,
+    ward_id INTEGER,
+    primary_diagnosis_id INTEGER,
+    discharge_disposition VARCHAR(100),
+    admission_count INTEGER,
+    readmissions INTEGER,
+    los_count INTEGER,
+    total_los INTEGER,
+    min_los INTEGER,
+    max_los INTEGER,
+    total_charges DECIMAL(15, 2),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS agg_admissions_daily (
+    admission_date DATE,
+    ward_id INTEGER,
+    primary_diagnosis_id INTEGER,
+    admission_count INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS agg_medication_clock (
+    max_scheduled_datetime TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- ============================================
 -- INDEXES FOR PERFORMANCE
 -- ============================================
@@ -343,3 +378,11 @@ CREATE INDEX idx_activities_patient ON fact_daily_activities(patient_id);
 CREATE INDEX idx_activities_date ON fact_daily_activities(activity_date);
 CREATE INDEX idx_patients_mrn ON dim_patients(mrn);
 
+-- Per-admission lookups on the Patient Care Plan page (filter on admission_id, newest first)
+CREATE INDEX idx_medication_admission ON fact_medication_administration(admission_id, scheduled_datetime DESC);
+CREATE INDEX idx_vitals_admission ON fact_vital_signs(admission_id, recorded_datetime DESC);
+CREATE INDEX idx_labs_admission ON fact_lab_results(admission_id, collected_datetime DESC);
+CREATE INDEX idx_procedures_admission ON fact_procedures(admission_id, actual_datetime DESC);
+CREATE INDEX idx_activities_admission ON fact_daily_activities(admission_id, activity_date DESC);
+CREATE INDEX idx_care_goals_admission ON fact_care_plan_goals(admission_id, created_datetime DESC);
+
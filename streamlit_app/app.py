@@ -14,10 +14,20 @@ import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
-sys.path.append(str(Path(__file__).parent.parent))
+PROJECT_ROOT = str(Path(__file__).parent.parent)
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 
 from config import APP_TITLE, HOSPITAL_NAME
 
+try:
+    from streamlit_app.utils.database import query_to_df, initialize_database_from_csv, test_connection, clear_query_caches
+    _DB_AVAILABLE = True
+    _DB_IMPORT_ERROR = None
+except ImportError as e:
+    _DB_AVAILABLE = False
+    _DB_IMPORT_ERROR = e
+
 # Page configuration
 st.set_page_config(
     page_title=APP_TITLE,
@@ -76,52 +86,47 @@ st.info("""
 st.subheader("Quick Overview")
 
 try:
-    from streamlit_app.utils.database import query_to_df, initialize_database_from_csv, test_connection
+    if not _DB_AVAILABLE:
+        raise _DB_IMPORT_ERROR
     
     # Test connection
     if not test_connection():
-        st.error("Database connection failed. Please check your configuration.")
+        st.error("Database connection failed or the database is missing summary tables. Please check your configuration.")
         st.info("If using DuckDB, click the button below to initialize the database from CSV files.")
         
         if st.button("Initialize Database from CSV"):
             with st.spinner("Loading data..."):
                 try:
                     initialize_database_from_csv()
+                    clear_query_caches()
                     st.success("Database initialized successfully!")
-                    st.experimental_rerun()
+                    st.rerun()
                 except Exception as e:
                     st.error(f"Initialization failed: {e}")
     else:
         # Display quick stats
         col1, col2, col3, col4 = st.columns(4)
         
-        with col1:
-            try:
-                result = query_to_df("SELECT COUNT(*) as count FROM dim_patients")
-                st.metric("Total Patients", f"{result['count'][0]:,}")
-            except:
-                st.metric("Total Patients", "N/A")
-        
-        with col2:
-            try:
-                result = query_to_df("SELECT COUNT(*) as count FROM fact_admissions")
-                st.metric("Total Admissions", f"{result['count'][0]:,}")
-            except:
-                st.metric("Total Admissions", "N/A")
-        
-        with col3:
-            try:
-                result = query_to_df("SELECT COUNT(*) as count FROM dim_staff WHERE is_active = TRUE")
-                st.metric("Active Staff", f"{result['count'][0]:,}")
-            except:
-                st.metric("Active Staff", "N/A")
+        try:
+            overview = query_to_df("""
+                SELECT
+                    (SELECT COUNT(*) FROM dim_patients) AS patients,
+                    (SELECT COUNT(*) FROM fact_admissions) AS admissions,
+                    (SELECT COUNT(*) FROM dim_staff WHERE is_active = TRUE) AS active_staff,
+                    (SELECT CAST(SUM(bed_capacity) AS INTEGER) FROM dim_wards) AS beds
+            """).iloc[0]
+            stats = {
+                "Total Patients": f"{overview['patients']:,}",
+                "Total Admissions": f"{overview['admissions']:,}",
+                "Active Staff": f"{overview['active_staff']:,}",
+                "Total Beds": f"{overview['beds']:,}",
+            }
+        except:
+            stats = dict.fromkeys(["Total Patients", "Total Admissions", "Active Staff", "Total Beds"], "N/A")
         
-        with col4:
-            try:
-                result = query_to_df("SELECT SUM(bed_capacity) as count FROM dim_wards")
-                st.metric("Total Beds", f"{result['count'][0]:,}")
-            except:
-                st.metric("Total Beds", "N/A")
+        for col, (label, value) in zip((col1, col2, col3, col4), stats.items()):
+            with col:
+                st.metric(label, value)
 
 except Exception as e:
     st.error(f"Error loading dashboard: {e}")
@@ -11,20 +11,16 @@ Pipeline Role: Consumes aggregated GOLD layer data to deliver executive-level in
 import streamlit as st
 import sys
 from pathlib import Path
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
 from datetime import datetime
 
 # Add parent directory to path
-sys.path.append(str(Path(__file__).parent.parent.parent))
+PROJECT_ROOT = str(Path(__file__).parent.parent.parent)
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 
 from streamlit_app.utils.database import query_to_df
 from streamlit_app.utils.queries import (
-    QUERY_CURRENT_OCCUPANCY,
-    QUERY_AVG_LENGTH_OF_STAY,
-    QUERY_READMISSION_RATE,
-    QUERY_TODAY_ADMISSIONS,
+    QUERY_EXECUTIVE_KPIS,
     QUERY_ADMISSION_TRENDS,
     QUERY_REVENUE_BY_DEPARTMENT,
     QUERY_TOP_DIAGNOSES
@@ -38,13 +34,25 @@ st.markdown("Hospital-wide performance metrics and key indicators")
 # KPI Cards
 st.subheader("Key Performance Indicators")
 
+# All four KPIs come from one query; occupancy and readmission also feed the alerts below
+occupancy_rate = None
+avg_los = None
+readmission_rate = None
+today_admissions = None
+
 try:
+    kpis = query_to_df(QUERY_EXECUTIVE_KPIS)
+    if not kpis.empty:
+        occupancy_rate = kpis['occupancy_rate'].iat[0]
+        avg_los = kpis['avg_los'].iat[0]
+        readmission_rate = kpis['readmission_rate'].iat[0]
+        today_admissions = kpis['today_admissions'].iat[0]
+    
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        occupancy = query_to_df(QUERY_CURRENT_OCCUPANCY)
-        if not occupancy.empty:
-            rate = occupancy['occupancy_rate'][0]
+        if occupancy_rate is not None:
+            rate = occupancy_rate
             st.metric(
                 "Bed Occupancy Rate",
                 f"{rate}%",
@@ -55,17 +63,14 @@ try:
             st.metric("Bed Occupancy Rate", "N/A")
     
     with col2:
-        los = query_to_df(QUERY_AVG_LENGTH_OF_STAY)
-        if not los.empty:
-            avg_los = los['avg_los'][0]
+        if avg_los is not None:
             st.metric("Avg Length of Stay", f"{avg_los} days")
         else:
             st.metric("Avg Length of Stay", "N/A")
     
     with col3:
-        readmit = query_to_df(QUERY_READMISSION_RATE)
-        if not readmit.empty:
-            rate = readmit['readmission_rate'][0]
+        if readmission_rate is not None:
+            rate = readmission_rate
             st.metric(
                 "30-Day Readmission Rate",
                 f"{rate}%",
@@ -76,10 +81,8 @@ try:
             st.metric("30-Day Readmission Rate", "N/A")
     
     with col4:
-        today_admits = query_to_df(QUERY_TODAY_ADMISSIONS)
-        if not today_admits.empty:
-            count = today_admits['today_admissions'][0]
-            st.metric("Today's Admissions", f"{count}")
+        if today_admissions is not None:
+            st.metric("Today's Admissions", f"{today_admissions}")
         else:
             st.metric("Today's Admissions", "0")
 
@@ -88,35 +91,51 @@ except Exception as e:
 
 st.markdown("---")
 
-# Admission Trends
-col_left, col_right = st.columns(2)
+# Figures are cached on their input frame, so reruns over unchanged data skip Plotly's figure build
+@st.cache_data(ttl=300, show_spinner=False)
+def build_admission_trends_fig(trends):
+    import plotly.express as px  # deferred: pages that fail before charting skip the import
+    fig = px.line(
+        trends,
+        x='month',
+        y='admission_count',
+        title='Monthly Admissions',
+        labels={'month': 'Month', 'admission_count': 'Admissions'},
+        markers=True
+    )
+    fig.update_layout(height=400)
+    return fig
+
+@st.cache_data(ttl=300, show_spinner=False)
+def build_revenue_fig(revenue):
+    import plotly.express as px
+    fig = px.bar(
+        revenue,
+        x='department',
+        y='total_revenue',
+        title='Total Revenue by Department',
+        labels={'department': 'Department', 'total_revenue': 'Revenue ($)'},
+        color_discrete_sequence=['#3182bd']
+    )
+    fig.update_layout(height=400)
+    return fig
 
-with col_left:
-    st.subheader("Admission Trends (Last 12 Months)")
+# Admission Trends
+# Each section is a fragment, so an interaction inside one reruns only that section
+@st.fragment
+def render_admission_trends():
     try:
-        trends = query_to_df(QUERY_ADMISSION_TRENDS)
+        trends = query_to_df(QUERY_ADMISSION_TRENDS).astype({'admission_count': 'int32'})
         if not trends.empty:
-            # Get last 12 months
-            trends['month'] = pd.to_datetime(trends['month'])
-            trends = trends.sort_values('month').tail(12)
-            
-            fig = px.line(
-                trends,
-                x='month',
-                y='admission_count',
-                title='Monthly Admissions',
-                labels={'month': 'Month', 'admission_count': 'Admissions'},
-                markers=True
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(build_admission_trends_fig(trends), use_container_width=True)
         else:
             st.info("No admission data available")
     except Exception as e:
         st.error(f"Error loading trends: {e}")
 
-with col_right:
-    st.subheader("Top 10 Diagnoses (Last 6 Months)")
+@st.fragment
+def render_top_diagnoses():
+    import plotly.express as px
     try:
         diagnoses = query_to_df(QUERY_TOP_DIAGNOSES)
         if not diagnoses.empty:
@@ -136,67 +155,74 @@ with col_right:
     except Exception as e:
         st.error(f"Error loading diagnoses: {e}")
 
+col_left, col_right = st.columns(2)
+
+with col_left:
+    st.subheader("Admission Trends (Last 12 Months)")
+    render_admission_trends()
+
+with col_right:
+    st.subheader("Top 10 Diagnoses (Last 6 Months)")
+    render_top_diagnoses()
+
 st.markdown("---")
 
 # Revenue Analysis
 st.subheader("Revenue by Department (Last 90 Days)")
 
-try:
-    revenue = query_to_df(QUERY_REVENUE_BY_DEPARTMENT)
-    if not revenue.empty:
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            fig = px.bar(
-                revenue,
-                x='department',
-                y='total_revenue',
-                title='Total Revenue by Department',
-                labels={'department': 'Department', 'total_revenue': 'Revenue ($)'},
-                color='total_revenue',
-                color_continuous_scale='Blues'
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.dataframe(
-                revenue[['department', 'total_revenue', 'admission_count']].head(10),
-                hide_index=True,
-                use_container_width=True
-            )
-    else:
-        st.info("No revenue data available")
-except Exception as e:
-    st.error(f"Error loading revenue data: {e}")
+@st.fragment
+def render_revenue():
+    try:
+        revenue = query_to_df(QUERY_REVENUE_BY_DEPARTMENT).astype({'admission_count': 'int32'})
+        if not revenue.empty:
+            col1, col2 = st.columns([2, 1])
+            
+            with col1:
+                st.plotly_chart(build_revenue_fig(revenue), use_container_width=True)
+            
+            with col2:
+                st.dataframe(
+                    revenue.nlargest(10, 'total_revenue'),
+                    column_order=['department', 'total_revenue', 'admission_count'],
+                    hide_index=True,
+                    use_container_width=True
+                )
+        else:
+            st.info("No revenue data available")
+    except Exception as e:
+        st.error(f"Error loading revenue data: {e}")
+
+render_revenue()
 
 # Alert Section
 st.markdown("---")
 st.subheader("Alerts & Notifications")
 
-try:
-    # Check for critical metrics
-    alerts = []
-    
-    occupancy = query_to_df(QUERY_CURRENT_OCCUPANCY)
-    if not occupancy.empty and occupancy['occupancy_rate'][0] > 90:
-        alerts.append(("warning", f"High occupancy rate: {occupancy['occupancy_rate'][0]}% (Target: <90%)"))
-    
-    readmit = query_to_df(QUERY_READMISSION_RATE)
-    if not readmit.empty and readmit['readmission_rate'][0] > 15:
-        alerts.append(("error", f"Elevated readmission rate: {readmit['readmission_rate'][0]}% (Target: <12%)"))
-    
-    if alerts:
-        for alert_type, message in alerts:
-            if alert_type == "error":
-                st.error(message)
-            else:
-                st.warning(message)
-    else:
-        st.success("All metrics within normal ranges")
-
-except:
-    pass
+@st.fragment
+def render_alerts(occupancy_rate, readmission_rate):
+    try:
+        # Check for critical metrics
+        alerts = []
+        
+        if occupancy_rate is not None and occupancy_rate > 90:
+            alerts.append(("warning", f"High occupancy rate: {occupancy_rate}% (Target: <90%)"))
+        
+        if readmission_rate is not None and readmission_rate > 15:
+            alerts.append(("error", f"Elevated readmission rate: {readmission_rate}% (Target: <12%)"))
+        
+        if alerts:
+            for alert_type, message in alerts:
+                if alert_type == "error":
+                    st.error(message)
+                else:
+                    st.warning(message)
+        else:
+            st.success("All metrics within normal ranges")
+
+    except:
+        pass
+
+render_alerts(occupancy_rate, readmission_rate)
 
 st.markdown("---")
 st.caption(f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -13,16 +13,36 @@ Pipeline Role: Primary clinical interface querying GOLD layer patient-specific f
 import streamlit as st
 import sys
 from pathlib import Path
-import plotly.express as px
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 import pandas as pd
 from datetime import datetime, date
+from html import escape
 
-sys.path.append(str(Path(__file__).parent.parent.parent))
+PROJECT_ROOT = str(Path(__file__).parent.parent.parent)
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 
 from streamlit_app.utils.database import query_to_df
 from streamlit_app.utils.queries import *
 
+# Daily activity slider labels, built once instead of inside a lambda on every rerun
+MOBILITY_LABELS = {
+    1: "1 - Bedbound",
+    2: "2 - Chair only",
+    3: "3 - Walk with assistance",
+    4: "4 - Walk with device",
+    5: "5 - Independent"
+}
+
+SELF_CARE_LABELS = {
+    1: "1 - Total assistance",
+    2: "2 - Extensive help",
+    3: "3 - Moderate help",
+    4: "4 - Minimal help",
+    5: "5 - Independent"
+}
+
 st.set_page_config(page_title="Patient Care Plan", layout="wide")
 
 st.title("Patient Care Plan Dashboard")
@@ -31,6 +51,12 @@ st.markdown("Comprehensive patient care tracking and management")
 # Patient Search
 st.subheader("Find Patient")
 
+# Button callbacks update state before the click's own rerun, so no second st.rerun() is needed
+def clear_search():
+    st.session_state.selected_patient = None
+    st.session_state.selected_admission = None
+    st.session_state.search_term = None
+
 col1, col2, col3 = st.columns([2, 1, 1])
 
 with col1:
@@ -42,49 +68,86 @@ with col2:
 
 with col3:
     st.markdown("<br>", unsafe_allow_html=True)
-    clear_button = st.button("Clear", use_container_width=True)
+    st.button("Clear", use_container_width=True, on_click=clear_search)
 
-if clear_button:
-    st.session_state.selected_patient = None
-    st.session_state.selected_admission = None
-    st.rerun()
+# Keep the search across reruns so a row selection can be read back
+if search_button and search_term:
+    st.session_state.search_term = search_term
 
 # Search and display patients
-if search_button and search_term:
+if st.session_state.get('search_term'):
     try:
-        search_pattern = f"%{search_term}%"
-        patients = query_to_df(QUERY_SEARCH_PATIENTS, (search_pattern, search_pattern, search_pattern))
+        search_pattern = f"%{st.session_state.search_term}%"
+        patients = query_to_df(QUERY_SEARCH_PATIENTS, (search_pattern,))
         
         if not patients.empty:
             st.success(f"Found {len(patients)} patient(s)")
+            st.caption("Select a row to view the patient's care plan")
             
-            # Display search results
-            for idx, patient in patients.iterrows():
-                col_info, col_action = st.columns([4, 1])
-                
-                with col_info:
-                    # Convert to date if timestamp
-                    dob = pd.to_datetime(patient['date_of_birth']).date() if pd.notna(patient['date_of_birth']) else None
-                    age = (datetime.now().date() - dob).days // 365 if dob else 'N/A'
-                    st.write(f"**{patient['patient_name']}** | MRN: {patient['mrn']} | Age: {age} | {patient['gender']} | Blood Type: {patient['blood_type']}")
-                    admission_display = patient['admission_date'] if pd.notna(patient['admission_date']) else 'N/A'
-                    discharge_display = patient['discharge_date'] if pd.notna(patient['discharge_date']) else 'Current'
-                    st.caption(f"Ward: {patient['ward_name']} | Bed: {patient['bed_number']} | Admitted: {admission_display} | Discharged: {discharge_display} | Dx: {patient['diagnosis_name']}")
-                
-                with col_action:
-                    # Use admission_id for unique key (patient can have multiple admissions)
-                    if st.button(f"View", key=f"view_{patient['admission_id']}"):
-                        st.session_state.selected_patient = patient['patient_id']
-                        st.session_state.selected_admission = patient['admission_id']
-                        st.rerun()
-                
-                st.markdown("---")
+            def select_patient():
+                rows = st.session_state.patient_search_results.selection.rows
+                if rows:
+                    # Use admission_id as well (patient can have multiple admissions)
+                    st.session_state.selected_patient = int(patients['patient_id'].iat[rows[0]])
+                    st.session_state.selected_admission = int(patients['admission_id'].iat[rows[0]])
+                    st.session_state.search_term = None
+            
+            # One selectable table instead of a row of columns and a button per result
+            st.dataframe(
+                patients,
+                column_order=['mrn', 'patient_name', 'age', 'gender', 'blood_type', 'ward_name', 'bed_number', 'admission_date', 'discharge_date', 'diagnosis_name'],
+                column_config={
+                    'mrn': 'MRN',
+                    'patient_name': 'Patient',
+                    'age': 'Age',
+                    'gender': 'Gender',
+                    'blood_type': 'Blood Type',
+                    'ward_name': 'Ward',
+                    'bed_number': 'Bed',
+                    'admission_date': 'Admitted',
+                    'discharge_date': 'Discharged',
+                    'diagnosis_name': 'Diagnosis'
+                },
+                hide_index=True,
+                use_container_width=True,
+                on_select=select_patient,
+                selection_mode='single-row',
+                key='patient_search_results'
+            )
         else:
             st.warning("No patients found matching your search criteria")
     
     except Exception as e:
         st.error(f"Error searching patients: {e}")
 
+# Figures are cached on their input frame, so reruns over unchanged vitals skip Plotly's figure build
+@st.cache_data(ttl=300, show_spinner=False)
+def build_vitals_fig(vitals, admission_id):
+    # One 2x2 figure on a shared time axis instead of four separate charts
+    fig = make_subplots(
+        rows=2,
+        cols=2,
+        shared_xaxes=True,
+        subplot_titles=('Blood Pressure', 'Temperature', 'Heart Rate', 'Oxygen Saturation')
+    )
+    
+    # Match px.line's render_mode='auto': WebGL above 1000 points, SVG below
+    scatter = go.Scattergl if len(vitals) > 1000 else go.Scatter
+    x = vitals['recorded_datetime']
+    fig.add_trace(scatter(x=x, y=vitals['blood_pressure_systolic'], name='Systolic', line=dict(color='red')), row=1, col=1)
+    fig.add_trace(scatter(x=x, y=vitals['blood_pressure_diastolic'], name='Diastolic', line=dict(color='blue')), row=1, col=1)
+    fig.add_trace(scatter(x=x, y=vitals['temperature'], name='Temperature', showlegend=False), row=1, col=2)
+    fig.add_trace(scatter(x=x, y=vitals['heart_rate'], name='Heart Rate', showlegend=False), row=2, col=1)
+    fig.add_trace(scatter(x=x, y=vitals['oxygen_saturation'], name='SpO2', showlegend=False), row=2, col=2)
+    
+    fig.update_yaxes(title_text='mmHg', row=1, col=1)
+    fig.update_yaxes(title_text='Celsius', row=1, col=2)
+    fig.update_yaxes(title_text='BPM', row=2, col=1)
+    fig.update_yaxes(title_text='SpO2 %', row=2, col=2)
+    # Keep zoom across fragment reruns for the same admission
+    fig.update_layout(height=600, uirevision=f"admission-{admission_id}")
+    return fig
+
 # Display selected patient details
 if 'selected_patient' in st.session_state and st.session_state.selected_patient is not None:
     st.markdown("---")
@@ -104,8 +167,7 @@ if 'selected_patient' in st.session_state and st.session_state.selected_patient
             header_col1, header_col2, header_col3, header_col4 = st.columns(4)
             
             with header_col1:
-                dob = pd.to_datetime(p['date_of_birth']).date() if pd.notna(p['date_of_birth']) else None
-                age = (datetime.now().date() - dob).days // 365 if dob else 'N/A'
+                age = p['age'] if pd.notna(p['age']) else 'N/A'
                 st.metric("Patient", f"{p['first_name']} {p['last_name']}")
                 st.caption(f"MRN: {p['mrn']} | Age: {age} | {p['gender']}")
             
@@ -118,15 +180,11 @@ if 'selected_patient' in st.session_state and st.session_state.selected_patient
                 st.caption(p['diagnosis_name'])
             
             with header_col4:
-                adm_date = pd.to_datetime(p['admission_date']).date() if pd.notna(p['admission_date']) else None
-                if adm_date and p['discharge_date'] and pd.notna(p['discharge_date']):
-                    disch_date = pd.to_datetime(p['discharge_date']).date()
-                    los = (disch_date - adm_date).days
-                    st.metric("Length of Stay", f"{los} days")
+                if pd.notna(p['los_days']) and pd.notna(p['discharge_date']):
+                    st.metric("Length of Stay", f"{p['los_days']} days")
                     st.caption(f"Admitted: {p['admission_date']} | Discharged: {p['discharge_date']}")
-                elif adm_date:
-                    los = (datetime.now().date() - adm_date).days
-                    st.metric("Length of Stay", f"{los} days (ongoing)")
+                elif pd.notna(p['los_days']):
+                    st.metric("Length of Stay", f"{p['los_days']} days (ongoing)")
                     st.caption(f"Admitted: {p['admission_date']}")
                 else:
                     st.metric("Length of Stay", "N/A")
@@ -146,137 +204,99 @@ if 'selected_patient' in st.session_state and st.session_state.selected_patient
             ])
             
             # Tab 1: Care Goals
-            with tab1:
+            @st.fragment
+            def render_care_goals(admission_id):
                 st.subheader("Active Care Plan Goals")
                 
                 goals = query_to_df(QUERY_PATIENT_CARE_GOALS, (admission_id,))
                 
                 if not goals.empty:
-                    for _, goal in goals.iterrows():
+                    for goal in goals.itertuples(index=False):
                         with st.container():
                             col_goal, col_progress = st.columns([3, 1])
                             
                             with col_goal:
-                                st.write(f"**{goal['goal_type']}**")
-                                st.write(goal['goal_description'])
-                                st.caption(f"Target: {goal['target_date']} | Status: {goal['status']}")
+                                st.write(f"**{goal.goal_type}**")
+                                st.write(goal.goal_description)
+                                st.caption(f"Target: {goal.target_date} | Status: {goal.status}")
                             
                             with col_progress:
-                                st.progress(goal['progress_pct'] / 100)
-                                st.caption(f"{goal['progress_pct']}% Complete")
+                                st.progress(goal.progress_pct / 100)
+                                st.caption(f"{goal.progress_pct}% Complete")
                             
                             st.markdown("---")
                 else:
                     st.info("No active care goals")
             
+            with tab1:
+                render_care_goals(admission_id)
+            
             # Tab 2: Medication Administration Record (MAR)
-            with tab2:
+            @st.fragment
+            def render_medications(admission_id):
                 st.subheader("Medication Administration Record (Last 72 Hours)")
                 
                 meds = query_to_df(QUERY_PATIENT_MEDICATIONS, (admission_id,))
                 
                 if not meds.empty:
                     # Format for display
-                    meds['scheduled_datetime'] = pd.to_datetime(meds['scheduled_datetime'])
                     meds['date'] = meds['scheduled_datetime'].dt.strftime('%Y-%m-%d')
                     meds['time'] = meds['scheduled_datetime'].dt.strftime('%H:%M')
                     
-                    # Group by medication
-                    unique_meds = meds['drug_name'].unique()
+                    # Color code status, one dict lookup over the column
+                    def color_status(status):
+                        return status.map({
+                            'Given': 'background-color: #d4edda',
+                            'Missed': 'background-color: #f8d7da',
+                            'Refused': 'background-color: #fff3cd',
+                            'Held': 'background-color: #d1ecf1'
+                        }).fillna('')
                     
-                    for med_name in unique_meds:
+                    # Rows arrive ordered by drug, so one groupby pass splits them
+                    for med_name, med_df in meds.groupby('drug_name', sort=False):
                         with st.expander(f"**{med_name}**", expanded=True):
-                            med_df = meds[meds['drug_name'] == med_name].copy()
-                            
-                            # Display as table
-                            display_df = med_df[['date', 'time', 'dosage', 'route', 'status', 'administered_by']].copy()
-                            display_df.columns = ['Date', 'Time', 'Dose', 'Route', 'Status', 'Given By']
-                            
-                            # Color code status
-                            def color_status(val):
-                                if val == 'Given':
-                                    return 'background-color: #d4edda'
-                                elif val == 'Missed':
-                                    return 'background-color: #f8d7da'
-                                elif val == 'Refused':
-                                    return 'background-color: #fff3cd'
-                                elif val == 'Held':
-                                    return 'background-color: #d1ecf1'
-                                return ''
-                            
+                            # Columns are picked and relabelled at render time instead of copying each group
                             st.dataframe(
-                                display_df.style.map(color_status, subset=['Status']),
+                                med_df.style.apply(color_status, subset=['status']),
+                                column_order=['date', 'time', 'dosage', 'route', 'status', 'administered_by'],
+                                column_config={
+                                    'date': 'Date',
+                                    'time': 'Time',
+                                    'dosage': 'Dose',
+                                    'route': 'Route',
+                                    'status': 'Status',
+                                    'administered_by': 'Given By'
+                                },
                                 hide_index=True,
                                 use_container_width=True
                             )
                 else:
                     st.info("No recent medication records")
             
+            with tab2:
+                render_medications(admission_id)
+            
             # Tab 3: Vital Signs
-            with tab3:
+            @st.fragment
+            def render_vitals(admission_id):
                 st.subheader("Vital Signs Trends (Last 72 Hours)")
                 
                 vitals = query_to_df(QUERY_PATIENT_VITALS, (admission_id,))
                 
                 if not vitals.empty:
-                    vitals['recorded_datetime'] = pd.to_datetime(vitals['recorded_datetime'])
                     vitals = vitals.sort_values('recorded_datetime')
                     
-                    # Create charts
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        fig = go.Figure()
-                        fig.add_trace(go.Scatter(
-                            x=vitals['recorded_datetime'],
-                            y=vitals['blood_pressure_systolic'],
-                            name='Systolic',
-                            line=dict(color='red')
-                        ))
-                        fig.add_trace(go.Scatter(
-                            x=vitals['recorded_datetime'],
-                            y=vitals['blood_pressure_diastolic'],
-                            name='Diastolic',
-                            line=dict(color='blue')
-                        ))
-                        fig.update_layout(title='Blood Pressure', yaxis_title='mmHg', height=300)
-                        st.plotly_chart(fig, use_container_width=True)
-                        
-                        fig2 = px.line(
-                            vitals,
-                            x='recorded_datetime',
-                            y='heart_rate',
-                            title='Heart Rate',
-                            labels={'heart_rate': 'BPM'}
-                        )
-                        fig2.update_layout(height=300)
-                        st.plotly_chart(fig2, use_container_width=True)
-                    
-                    with col2:
-                        fig3 = px.line(
-                            vitals,
-                            x='recorded_datetime',
-                            y='temperature',
-                            title='Temperature',
-                            labels={'temperature': 'Celsius'}
-                        )
-                        fig3.update_layout(height=300)
-                        st.plotly_chart(fig3, use_container_width=True)
-                        
-                        fig4 = px.line(
-                            vitals,
-                            x='recorded_datetime',
-                            y='oxygen_saturation',
-                            title='Oxygen Saturation',
-                            labels={'oxygen_saturation': 'SpO2 %'}
-                        )
-                        fig4.update_layout(height=300)
-                        st.plotly_chart(fig4, use_container_width=True)
+                    st.plotly_chart(build_vitals_fig(vitals, admission_id), use_container_width=True, config={'displayModeBar': False})
                 else:
                     st.info("No vital signs data available")
             
+            with tab3:
+                render_vitals(admission_id)
+            
             # Tab 4: Daily Activities (THE STAR FEATURE with Comments)
-            with tab4:
+            # Form widgets rerun only this fragment instead of re-querying every tab
+            @st.fragment
+            def render_daily_activities(admission_id):
                 st.subheader("Daily Activity Log (Activities of Daily Living)")
                 
                 # Activity Input Form
@@ -291,13 +311,7 @@ if 'selected_patient' in st.session_state and st.session_state.selected_patient
                             "Mobility",
                             options=[1, 2, 3, 4, 5],
                             value=3,
-                            format_func=lambda x: {
-                                1: "1 - Bedbound",
-                                2: "2 - Chair only",
-                                3: "3 - Walk with assistance",
-                                4: "4 - Walk with device",
-                                5: "5 - Independent"
-                            }[x]
+                            format_func=MOBILITY_LABELS.get
                         )
                         mobility_notes = st.text_input("Mobility Notes", placeholder="e.g., Walked to chair (assisted)")
                         
@@ -305,13 +319,7 @@ if 'selected_patient' in st.session_state and st.session_state.selected_patient
                             "Self-Care",
                             options=[1, 2, 3, 4, 5],
                             value=3,
-                            format_func=lambda x: {
-                                1: "1 - Total assistance",
-                                2: "2 - Extensive help",
-                                3: "3 - Moderate help",
-                                4: "4 - Minimal help",
-                                5: "5 - Independent"
-                            }[x]
+                            format_func=SELF_CARE_LABELS.get
                         )
                         
                         st.markdown("**Meals Consumed (%)**")
@@ -353,101 +361,118 @@ if 'selected_patient' in st.session_state and st.session_state.selected_patient
                 activities = query_to_df(QUERY_PATIENT_DAILY_ACTIVITIES, (admission_id,))
                 
                 if not activities.empty:
-                    for _, activity in activities.iterrows():
-                        with st.container():
-                            st.markdown(f"### {activity['activity_date']}")
-                            
-                            col1, col2, col3, col4 = st.columns(4)
-                            
-                            with col1:
-                                st.metric("Mobility", f"{activity['mobility_score']}/5")
-                                st.caption(activity['mobility_notes'] if pd.notna(activity['mobility_notes']) else "")
-                            
-                            with col2:
-                                st.metric("Self-Care", f"{activity['self_care_score']}/5")
-                                avg_meal = (activity['breakfast_percent_consumed'] + activity['lunch_percent_consumed'] + activity['dinner_percent_consumed']) / 3
-                                st.caption(f"Meals: {avg_meal:.0f}% avg")
-                            
-                            with col3:
-                                st.metric("Mental Status", activity['mental_status'])
-                                st.caption(f"Mood: {activity['mood']}")
-                            
-                            with col4:
-                                st.metric("Pain Level", f"{activity['pain_level']}/10")
-                                st.caption(f"Sleep: {activity['sleep_quality']}/5 quality")
-                            
-                            # Display comments if present
-                            if pd.notna(activity['comments']) and activity['comments']:
-                                st.info(f"**Comments:** {activity['comments']}")
-                            
-                            st.caption(f"Recorded by: {activity['recorded_by']}")
-                            st.markdown("---")
+                    # Build the whole history as one HTML block instead of ~10 elements per day
+                    def metric_html(label, value, caption):
+                        return (
+                            f"<div style='flex:1'><div style='font-size:0.875rem'>{label}</div>"
+                            f"<div style='font-size:1.75rem'>{escape(str(value))}</div>"
+                            f"<div style='font-size:0.875rem;color:grey'>{escape(str(caption))}</div></div>"
+                        )
+                    
+                    def activity_html(activity):
+                        metrics = "".join([
+                            metric_html("Mobility", f"{activity.mobility_score}/5", activity.mobility_notes if pd.notna(activity.mobility_notes) else ""),
+                            metric_html("Self-Care", f"{activity.self_care_score}/5", f"Meals: {activity.avg_meal_pct:.0f}% avg"),
+                            metric_html("Mental Status", activity.mental_status, f"Mood: {activity.mood}"),
+                            metric_html("Pain Level", f"{activity.pain_level}/10", f"Sleep: {activity.sleep_quality}/5 quality")
+                        ])
+                        comments = (
+                            f"<div style='background:#e7f3fe;padding:0.75rem;border-radius:0.5rem;margin:0.5rem 0'><b>Comments:</b> {escape(activity.comments)}</div>"
+                            if pd.notna(activity.comments) and activity.comments else ""
+                        )
+                        return (
+                            f"<h3>{activity.activity_date}</h3>"
+                            f"<div style='display:flex;gap:1rem'>{metrics}</div>{comments}"
+                            f"<div style='font-size:0.875rem;color:grey'>Recorded by: {escape(str(activity.recorded_by))}</div><hr>"
+                        )
+                    
+                    st.markdown(
+                        "".join(activity_html(activity) for activity in activities.itertuples(index=False)),
+                        unsafe_allow_html=True
+                    )
                 else:
                     st.info("No daily activity records yet")
             
+            with tab4:
+                render_daily_activities(admission_id)
+            
             # Tab 5: Lab Results
-            with tab5:
+            @st.fragment
+            def render_labs(admission_id):
                 st.subheader("Recent Lab Results")
                 
                 labs = query_to_df(QUERY_PATIENT_LABS, (admission_id,))
                 
                 if not labs.empty:
-                    labs['collected_datetime'] = pd.to_datetime(labs['collected_datetime'])
+                    labs['collected'] = labs['collected_datetime'].dt.strftime('%Y-%m-%d %H:%M')
                     
-                    # Display by test type
-                    test_types = labs['test_type'].unique()
+                    # Highlight abnormal results
+                    def highlight_abnormal(flag):
+                        return flag.map({
+                            'Critical': 'background-color: #f8d7da; font-weight: bold',
+                            'High': 'background-color: #fff3cd',
+                            'Low': 'background-color: #fff3cd'
+                        }).fillna('')
                     
-                    for test_type in test_types:
+                    # Display by test type
+                    for test_type, test_df in labs.groupby('test_type', sort=False):
                         with st.expander(f"**{test_type}**", expanded=True):
-                            test_df = labs[labs['test_type'] == test_type].copy()
-                            
-                            display_df = test_df[['test_name', 'test_value', 'unit_of_measure', 'reference_range', 'abnormal_flag', 'collected_datetime']].copy()
-                            display_df.columns = ['Test', 'Value', 'Unit', 'Reference Range', 'Flag', 'Date']
-                            display_df['Date'] = display_df['Date'].dt.strftime('%Y-%m-%d %H:%M')
-                            
-                            # Highlight abnormal results
-                            def highlight_abnormal(val):
-                                if val == 'Critical':
-                                    return 'background-color: #f8d7da; font-weight: bold'
-                                elif val in ['High', 'Low']:
-                                    return 'background-color: #fff3cd'
-                                return ''
-                            
                             st.dataframe(
-                                display_df.style.map(highlight_abnormal, subset=['Flag']),
+                                test_df.style.apply(highlight_abnormal, subset=['abnormal_flag']),
+                                column_order=['test_name', 'test_value', 'unit_of_measure', 'reference_range', 'abnormal_flag', 'collected'],
+                                column_config={
+                                    'test_name': 'Test',
+                                    'test_value': 'Value',
+                                    'unit_of_measure': 'Unit',
+                                    'reference_range': 'Reference Range',
+                                    'abnormal_flag': 'Flag',
+                                    'collected': 'Date'
+                                },
                                 hide_index=True,
                                 use_container_width=True
                             )
                 else:
                     st.info("No lab results available")
             
+            with tab5:
+                render_labs(admission_id)
+            
             # Tab 6: Procedures
-            with tab6:
+            @st.fragment
+            def render_procedures(admission_id):
                 st.subheader("Procedures Performed")
                 
                 procedures = query_to_df(QUERY_PATIENT_PROCEDURES, (admission_id,))
                 
                 if not procedures.empty:
-                    for _, proc in procedures.iterrows():
-                        with st.container():
-                            col1, col2 = st.columns([3, 1])
-                            
-                            with col1:
-                                st.write(f"**{proc['procedure_name']}** ({proc['procedure_type']})")
-                                st.caption(f"Scheduled: {proc['scheduled_datetime']} | Actual: {proc['actual_datetime']}")
-                                st.caption(f"Duration: {proc['duration_minutes']} minutes | Outcome: {proc['outcome']}")
-                                if pd.notna(proc['notes']):
-                                    st.info(proc['notes'])
-                            
-                            with col2:
-                                st.caption(f"Performed by:\n{proc['performed_by']}")
-                            
-                            st.markdown("---")
+                    # One HTML block for all procedures instead of several elements each
+                    def procedure_html(proc):
+                        notes = (
+                            f"<div style='background:#e7f3fe;padding:0.75rem;border-radius:0.5rem;margin:0.5rem 0'>{escape(proc.notes)}</div>"
+                            if pd.notna(proc.notes) else ""
+                        )
+                        return (
+                            f"<div style='display:flex;gap:1rem'><div style='flex:3'>"
+                            f"<b>{escape(proc.procedure_name)}</b> ({escape(proc.procedure_type)})"
+                            f"<div style='font-size:0.875rem;color:grey'>Scheduled: {proc.scheduled_datetime} | Actual: {proc.actual_datetime}</div>"
+                            f"<div style='font-size:0.875rem;color:grey'>Duration: {proc.duration_minutes} minutes | Outcome: {escape(str(proc.outcome))}</div>"
+                            f"{notes}</div>"
+                            f"<div style='flex:1;font-size:0.875rem;color:grey'>Performed by:<br>{escape(str(proc.performed_by))}</div></div><hr>"
+                        )
+                    
+                    st.markdown(
+                        "".join(procedure_html(proc) for proc in procedures.itertuples(index=False)),
+                        unsafe_allow_html=True
+                    )
                 else:
                     st.info("No procedures recorded")
             
+            with tab6:
+                render_procedures(admission_id)
+            
             # Tab 7: Historical Admissions
-            with tab7:
+            @st.fragment
+            def render_history(patient_id):
                 st.subheader("Previous Admissions (5-Year History)")
                 
                 history = query_to_df(QUERY_PATIENT_HISTORY, (patient_id,))
@@ -465,13 +490,16 @@ if 'selected_patient' in st.session_state and st.session_state.selected_patient
                     )
                 else:
                     st.info("No previous admissions on record")
+            
+            with tab7:
+                render_history(patient_id)
     
     except Exception as e:
         st.error(f"Error loading patient details: {e}")
         import traceback
         st.code(traceback.format_exc())
 elif not ('selected_patient' in st.session_state and st.session_state.selected_patient):
-    if not (search_button and search_term):
+    if not st.session_state.get('search_term'):
         st.info("Search for a patient above to view their care plan")
 
 st.markdown("---")
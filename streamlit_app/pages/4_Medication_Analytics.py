@@ -17,7 +17,9 @@ import plotly.graph_objects as go
 import pandas as pd
 from datetime import datetime
 
-sys.path.append(str(Path(__file__).parent.parent.parent))
+PROJECT_ROOT = str(Path(__file__).parent.parent.parent)
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 
 from streamlit_app.utils.database import query_to_df
 from streamlit_app.utils.queries import (
@@ -31,15 +33,22 @@ st.set_page_config(page_title="Medication Analytics", layout="wide")
 st.title("Medication Analytics Dashboard")
 st.markdown("Medication administration tracking, adherence, and safety metrics")
 
+# Shared queries run once per render and feed every section that uses them
+try:
+    adherence_data = query_to_df(QUERY_MEDICATION_ADHERENCE)
+    errors = query_to_df(QUERY_MEDICATION_ERRORS)
+except Exception as e:
+    st.error(f"Error loading medication data: {e}")
+    adherence_data = errors = pd.DataFrame()
+
 # KPI Cards
 st.subheader("Medication Administration Overview (Historical Data)")
 
 try:
-    adherence_data = query_to_df(QUERY_MEDICATION_ADHERENCE)
-    
     if not adherence_data.empty:
-        total_doses = adherence_data['total_doses'].sum()
-        doses_given = adherence_data['doses_given'].sum()
+        # Hospital-wide totals come back from SQL on every ward row
+        total_doses = adherence_data['overall_doses'].iat[0]
+        doses_given = adherence_data['overall_doses_given'].iat[0]
         overall_adherence = (doses_given / total_doses * 100) if total_doses > 0 else 0
         doses_missed = total_doses - doses_given
         
@@ -66,6 +75,68 @@ except Exception as e:
 
 st.markdown("---")
 
+# Figures are cached on their input frame, so reruns over unchanged data skip Plotly's figure build
+@st.cache_data(ttl=300, show_spinner=False)
+def build_adherence_fig(adherence_data):
+    fig = px.bar(
+        adherence_data,
+        x='adherence_rate',
+        y='ward_name',
+        orientation='h',
+        title='Adherence Rate by Ward (%)',
+        labels={'adherence_rate': 'Adherence %', 'ward_name': 'Ward'},
+        color='adherence_rate',
+        color_continuous_scale='RdYlGn',
+        range_color=[80, 100]
+    )
+    fig.add_vline(x=95, line_dash="dash", line_color="red", annotation_text="Target: 95%")
+    fig.update_layout(height=400)
+    return fig
+
+@st.cache_data(ttl=300, show_spinner=False)
+def build_issue_distribution_fig(errors):
+    return px.pie(
+        errors,
+        names='status',
+        values='count',
+        title='Distribution of Non-Administered Doses',
+        color_discrete_map={
+            'Missed': '#ff6b6b',
+            'Refused': '#feca57',
+            'Held': '#48dbfb'
+        }
+    )
+
+@st.cache_data(ttl=300, show_spinner=False)
+def build_issues_by_ward_fig(errors):
+    # Pivot once so each status is a single stacked trace over the same ward axis
+    errors_wide = errors.pivot(index='ward_name', columns='status', values='count').fillna(0).astype('int64')
+    fig = go.Figure([
+        go.Bar(x=errors_wide.index.to_numpy(), y=errors_wide[status].to_numpy(), name=status)
+        for status in ['Missed', 'Refused', 'Held']
+        if status in errors_wide.columns
+    ])
+    fig.update_layout(
+        title='Issues by Ward',
+        xaxis_title='Ward',
+        yaxis_title='Count',
+        legend_title_text='status',
+        barmode='stack'
+    )
+    fig.update_xaxes(tickangle=45)
+    return fig
+
+@st.cache_data(ttl=300, show_spinner=False)
+def build_drug_class_fig(class_summary):
+    return px.treemap(
+        class_summary,
+        path=['drug_class'],
+        values='administration_count',
+        title='Medication Volume by Drug Class',
+        color='total_cost',
+        color_continuous_scale='Blues'
+    )
+
 # Adherence by Ward
 col1, col2 = st.columns(2)
 
@@ -73,30 +144,22 @@ with col1:
     st.subheader("Medication Adherence by Ward")
     
     try:
-        adherence_data = query_to_df(QUERY_MEDICATION_ADHERENCE)
-        
         if not adherence_data.empty:
-            fig = px.bar(
-                adherence_data.sort_values('adherence_rate'),
-                x='adherence_rate',
-                y='ward_name',
-                orientation='h',
-                title='Adherence Rate by Ward (%)',
-                labels={'adherence_rate': 'Adherence %', 'ward_name': 'Ward'},
-                color='adherence_rate',
-                color_continuous_scale='RdYlGn',
-                range_color=[80, 100]
-            )
-            fig.add_vline(x=95, line_dash="dash", line_color="red", annotation_text="Target: 95%")
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(build_adherence_fig(adherence_data), use_container_width=True)
             
             # Data table
-            display_df = adherence_data[['ward_name', 'total_doses', 'doses_given', 'adherence_rate']].copy()
-            display_df.columns = ['Ward', 'Scheduled', 'Given', 'Adherence %']
-            display_df = display_df.sort_values('Adherence %')
-            
-            st.dataframe(display_df, hide_index=True, use_container_width=True)
+            st.dataframe(
+                adherence_data,
+                column_order=['ward_name', 'total_doses', 'doses_given', 'adherence_rate'],
+                column_config={
+                    'ward_name': 'Ward',
+                    'total_doses': 'Scheduled',
+                    'doses_given': 'Given',
+                    'adherence_rate': 'Adherence %'
+                },
+                hide_index=True,
+                use_container_width=True
+            )
         else:
             st.info("No adherence data available")
     
@@ -107,35 +170,12 @@ with col2:
     st.subheader("Medication Administration Issues")
     
     try:
-        errors = query_to_df(QUERY_MEDICATION_ERRORS)
-        
         if not errors.empty:
             # Pie chart of error types
-            fig = px.pie(
-                errors,
-                names='status',
-                values='count',
-                title='Distribution of Non-Administered Doses',
-                color_discrete_map={
-                    'Missed': '#ff6b6b',
-                    'Refused': '#feca57',
-                    'Held': '#48dbfb'
-                }
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(build_issue_distribution_fig(errors), use_container_width=True)
             
             # Bar chart by ward
-            fig2 = px.bar(
-                errors,
-                x='ward_name',
-                y='count',
-                color='status',
-                title='Issues by Ward',
-                labels={'count': 'Count', 'ward_name': 'Ward'},
-                barmode='stack'
-            )
-            fig2.update_xaxes(tickangle=45)
-            st.plotly_chart(fig2, use_container_width=True)
+            st.plotly_chart(build_issues_by_ward_fig(errors), use_container_width=True)
         else:
             st.info("No medication issues recorded")
     
@@ -147,144 +187,159 @@ st.markdown("---")
 # Top Medications
 st.subheader("Most Administered Medications (Last 90 Days of Data)")
 
-try:
-    top_meds = query_to_df(QUERY_TOP_MEDICATIONS)
-    
-    if not top_meds.empty:
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            fig = px.bar(
-                top_meds.head(15),
-                x='administration_count',
-                y='drug_name',
-                orientation='h',
-                title='Top 15 Medications by Administration Count',
-                labels={'administration_count': 'Number of Doses', 'drug_name': 'Medication'},
-                color='drug_class',
-                hover_data=['drug_class', 'total_cost']
-            )
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
+# Each section is a fragment, so an interaction inside one reruns only that section
+@st.fragment
+def render_top_medications():
+    try:
+        top_meds = query_to_df(QUERY_TOP_MEDICATIONS)
         
-        with col2:
-            # Cost analysis
-            st.markdown("**Cost Analysis**")
+        if not top_meds.empty:
+            col1, col2 = st.columns([2, 1])
             
-            total_cost = top_meds['total_cost'].sum()
-            st.metric("Total Medication Cost", f"${total_cost:,.2f}")
+            with col1:
+                fig = px.bar(
+                    top_meds.head(15),
+                    x='administration_count',
+                    y='drug_name',
+                    orientation='h',
+                    title='Top 15 Medications by Administration Count',
+                    labels={'administration_count': 'Number of Doses', 'drug_name': 'Medication'},
+                    color='drug_class',
+                    hover_data=['drug_class', 'total_cost']
+                )
+                fig.update_layout(height=500)
+                st.plotly_chart(fig, use_container_width=True)
             
-            # Top cost drivers
-            st.markdown("**Most Expensive Medications**")
-            cost_df = top_meds.nlargest(10, 'total_cost')[['drug_name', 'total_cost']].copy()
-            cost_df['total_cost'] = cost_df['total_cost'].apply(lambda x: f"${x:,.2f}")
-            cost_df.columns = ['Medication', 'Total Cost']
-            st.dataframe(cost_df, hide_index=True, use_container_width=True)
-        
-        # Drug class distribution
-        st.markdown("### Administration by Drug Class")
-        class_summary = top_meds.groupby('drug_class').agg({
-            'administration_count': 'sum',
-            'total_cost': 'sum'
-        }).reset_index().sort_values('administration_count', ascending=False)
-        
-        fig3 = px.treemap(
-            class_summary,
-            path=['drug_class'],
-            values='administration_count',
-            title='Medication Volume by Drug Class',
-            color='total_cost',
-            color_continuous_scale='Blues'
-        )
-        st.plotly_chart(fig3, use_container_width=True)
-    else:
-        st.info("No medication data available")
+            with col2:
+                # Cost analysis
+                st.markdown("**Cost Analysis**")
+                
+                total_cost = top_meds['total_cost'].sum()
+                st.metric("Total Medication Cost", f"${total_cost:,.2f}")
+                
+                # Top cost drivers
+                st.markdown("**Most Expensive Medications**")
+                # Currency formatting happens at render time, so the column stays numeric and sorts correctly
+                cost_df = top_meds.nlargest(10, 'total_cost')
+                st.dataframe(
+                    cost_df.style.format({'total_cost': '${:,.2f}'}),
+                    column_order=['drug_name', 'total_cost'],
+                    column_config={'drug_name': 'Medication', 'total_cost': 'Total Cost'},
+                    hide_index=True,
+                    use_container_width=True
+                )
+            
+            # Drug class distribution
+            st.markdown("### Administration by Drug Class")
+            class_summary = top_meds.groupby('drug_class', as_index=False, sort=False).agg({
+                'administration_count': 'sum',
+                'total_cost': 'sum'
+            }).sort_values('administration_count', ascending=False)
+            
+            st.plotly_chart(build_drug_class_fig(class_summary), use_container_width=True)
+        else:
+            st.info("No medication data available")
 
-except Exception as e:
-    st.error(f"Error loading top medications: {e}")
+    except Exception as e:
+        st.error(f"Error loading top medications: {e}")
+
+render_top_medications()
 
 # Timing Analysis
 st.markdown("---")
 st.subheader("Medication Administration Timing Analysis")
 
-try:
-    timing_query = """
-    SELECT 
-        EXTRACT(HOUR FROM scheduled_datetime) as hour,
-        COUNT(*) as scheduled_count,
-        SUM(CASE WHEN status = 'Given' THEN 1 ELSE 0 END) as given_count
-    FROM fact_medication_administration
-    WHERE scheduled_datetime >= (SELECT MAX(scheduled_datetime) FROM fact_medication_administration) - INTERVAL '30 days'
-    GROUP BY EXTRACT(HOUR FROM scheduled_datetime)
-    ORDER BY hour
-    """
-    
-    timing = query_to_df(timing_query)
-    
-    if not timing.empty:
-        timing['on_time_rate'] = (timing['given_count'] / timing['scheduled_count'] * 100).round(1)
-        
-        fig = go.Figure()
-        fig.add_trace(go.Bar(
-            x=timing['hour'],
-            y=timing['scheduled_count'],
-            name='Scheduled',
-            marker_color='lightblue'
-        ))
-        fig.add_trace(go.Bar(
-            x=timing['hour'],
-            y=timing['given_count'],
-            name='Administered',
-            marker_color='darkblue'
-        ))
-        
-        fig.update_layout(
-            title='Medication Administration by Hour of Day',
-            xaxis_title='Hour (24-hour format)',
-            yaxis_title='Number of Doses',
-            barmode='group',
-            height=400
-        )
+@st.fragment
+def render_timing_analysis():
+    try:
+        timing_query = """
+        SELECT 
+            EXTRACT(HOUR FROM scheduled_datetime) as hour,
+            COUNT(*) as scheduled_count,
+            COUNT_IF(status = 'Given') as given_count,
+            ROUND(COUNT_IF(status = 'Given') * 100.0 / COUNT(*), 1) as on_time_rate
+        FROM fact_medication_administration
+        WHERE scheduled_datetime >= (SELECT max_scheduled_datetime FROM agg_medication_clock) - INTERVAL '30 days'
+        GROUP BY EXTRACT(HOUR FROM scheduled_datetime)
+        ORDER BY hour
+        """
         
-        st.plotly_chart(fig, use_container_width=True)
+        timing = query_to_df(timing_query)
         
-        # Peak hours
-        peak_hour = timing.loc[timing['scheduled_count'].idxmax(), 'hour']
-        st.info(f"**Peak medication administration hour:** {int(peak_hour)}:00 with {timing['scheduled_count'].max()} scheduled doses")
+        if not timing.empty:
+            fig = go.Figure()
+            fig.add_trace(go.Bar(
+                x=timing['hour'],
+                y=timing['scheduled_count'],
+                name='Scheduled',
+                marker_color='lightblue'
+            ))
+            fig.add_trace(go.Bar(
+                x=timing['hour'],
+                y=timing['given_count'],
+                name='Administered',
+                marker_color='darkblue'
+            ))
+            
+            fig.update_layout(
+                title='Medication Administration by Hour of Day',
+                xaxis_title='Hour (24-hour format)',
+                yaxis_title='Number of Doses',
+                barmode='group',
+                height=400
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # Peak hours
+            scheduled = timing['scheduled_count'].to_numpy()
+            peak = scheduled.argmax()
+            peak_hour = timing['hour'].to_numpy()[peak]
+            st.info(f"**Peak medication administration hour:** {int(peak_hour)}:00 with {int(scheduled[peak])} scheduled doses")
     
-except Exception as e:
-    st.error(f"Error loading timing analysis: {e}")
+    except Exception as e:
+        st.error(f"Error loading timing analysis: {e}")
+
+render_timing_analysis()
 
 # Safety Alerts
 st.markdown("---")
 st.subheader("Safety Alerts & Recommendations")
 
-try:
-    adherence_data = query_to_df(QUERY_MEDICATION_ADHERENCE)
-    
-    if not adherence_data.empty:
-        low_adherence_wards = adherence_data[adherence_data['adherence_rate'] < 95]
-        
-        if not low_adherence_wards.empty:
-            st.warning("**Wards Below Target Adherence (95%):**")
-            for _, ward in low_adherence_wards.iterrows():
-                st.write(f"- **{ward['ward_name']}**: {ward['adherence_rate']:.1f}% adherence")
-        else:
-            st.success("All wards meeting adherence targets (>95%)")
-    
-    # Check for high error rates
-    errors = query_to_df(QUERY_MEDICATION_ERRORS)
-    if not errors.empty:
-        high_error_wards = errors.groupby('ward_name')['count'].sum().reset_index()
-        high_error_wards = high_error_wards[high_error_wards['count'] > 20]
+@st.fragment
+def render_safety_alerts(adherence_data, errors):
+    try:
+        if not adherence_data.empty:
+            # The query orders wards by adherence_rate, so the wards below target are a leading slice
+            below_target = adherence_data['adherence_rate'].to_numpy().searchsorted(95)
+            low_adherence_wards = adherence_data.iloc[:below_target]
+            
+            if not low_adherence_wards.empty:
+                st.warning("**Wards Below Target Adherence (95%):**")
+                # One markdown block for the whole list instead of a write per ward
+                st.markdown("\n".join(
+                    f"- **{name}**: {rate:.1f}% adherence"
+                    for name, rate in zip(low_adherence_wards['ward_name'].to_numpy(), low_adherence_wards['adherence_rate'].to_numpy())
+                ))
+            else:
+                st.success("All wards meeting adherence targets (>95%)")
         
-        if not high_error_wards.empty:
-            st.error("**Wards with High Error Counts (>20 issues):**")
-            for _, ward in high_error_wards.iterrows():
-                st.write(f"- **{ward['ward_name']}**: {ward['count']} issues")
+        # Check for high error rates
+        if not errors.empty:
+            high_error_wards = errors.groupby('ward_name', as_index=False, sort=False)['count'].sum()
+            high_error_wards = high_error_wards[high_error_wards['count'] > 20]
+            
+            if not high_error_wards.empty:
+                st.error("**Wards with High Error Counts (>20 issues):**")
+                st.markdown("\n".join(
+                    f"- **{name}**: {count} issues"
+                    for name, count in zip(high_error_wards['ward_name'].to_numpy(), high_error_wards['count'].to_numpy())
+                ))
 
-except Exception as e:
-    pass
+    except Exception as e:
+        pass
+
+render_safety_alerts(adherence_data, errors)
 
 st.markdown("---")
 st.caption(f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
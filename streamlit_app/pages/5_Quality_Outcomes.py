@@ -17,13 +17,15 @@ import plotly.graph_objects as go
 import pandas as pd
 from datetime import datetime
 
-sys.path.append(str(Path(__file__).parent.parent.parent))
+PROJECT_ROOT = str(Path(__file__).parent.parent.parent)
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 
 from streamlit_app.utils.database import query_to_df
 from streamlit_app.utils.queries import (
     QUERY_READMISSION_BY_DIAGNOSIS,
     QUERY_AVERAGE_LOS_BY_WARD,
-    QUERY_READMISSION_RATE
+    QUERY_QUALITY_SUMMARY
 )
 
 st.set_page_config(page_title="Quality & Outcomes", layout="wide")
@@ -31,6 +33,14 @@ st.set_page_config(page_title="Quality & Outcomes", layout="wide")
 st.title("Quality & Outcomes Dashboard")
 st.markdown("Clinical quality metrics, readmission analysis, and patient outcomes")
 
+# Shared queries run once per render and feed every section that uses them
+try:
+    quality_summary = query_to_df(QUERY_QUALITY_SUMMARY)
+    los_data = query_to_df(QUERY_AVERAGE_LOS_BY_WARD)
+except Exception as e:
+    st.error(f"Error loading quality data: {e}")
+    quality_summary = los_data = pd.DataFrame()
+
 # Quality Metrics Overview
 st.subheader("Quality Metrics Summary")
 
@@ -38,9 +48,8 @@ try:
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        readmit_rate = query_to_df(QUERY_READMISSION_RATE)
-        if not readmit_rate.empty:
-            rate = readmit_rate['readmission_rate'][0]
+        if not quality_summary.empty:
+            rate = quality_summary['readmission_rate'].iat[0]
             st.metric(
                 "30-Day Readmission Rate",
                 f"{rate}%",
@@ -52,14 +61,8 @@ try:
     
     with col2:
         # Average LOS
-        los_query = """
-        SELECT ROUND(AVG(length_of_stay), 1) as avg_los
-        FROM fact_admissions
-        WHERE discharge_date >= CURRENT_DATE - INTERVAL '30 days'
-        """
-        los = query_to_df(los_query)
-        if not los.empty:
-            st.metric("Average Length of Stay", f"{los['avg_los'][0]} days")
+        if not quality_summary.empty:
+            st.metric("Average Length of Stay", f"{quality_summary['avg_los'].iat[0]} days")
         else:
             st.metric("Average Length of Stay", "N/A")
     
@@ -115,11 +118,11 @@ with col2:
     try:
         trend_query = """
         SELECT 
-            DATE_TRUNC('month', discharge_date) as month,
-            COUNT(*) as total_discharges,
-            SUM(CASE WHEN is_readmission THEN 1 ELSE 0 END) as readmissions,
-            ROUND(SUM(CASE WHEN is_readmission THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 1) as readmission_rate
-        FROM fact_admissions
+            CAST(DATE_TRUNC('month', discharge_date) AS DATE) as month,
+            CAST(SUM(admission_count) AS INTEGER) as total_discharges,
+            CAST(SUM(readmissions) AS INTEGER) as readmissions,
+            ROUND(SUM(readmissions) * 100.0 / SUM(admission_count), 1) as readmission_rate
+        FROM agg_quality_daily
         WHERE discharge_date >= CURRENT_DATE - INTERVAL '12 months'
         GROUP BY DATE_TRUNC('month', discharge_date)
         ORDER BY month
@@ -128,8 +131,6 @@ with col2:
         trends = query_to_df(trend_query)
         
         if not trends.empty:
-            trends['month'] = pd.to_datetime(trends['month'])
-            
             fig = go.Figure()
             
             fig.add_trace(go.Scatter(
@@ -152,7 +153,7 @@ with col2:
             st.plotly_chart(fig, use_container_width=True)
             
             # Stats
-            latest_rate = trends.iloc[-1]['readmission_rate']
+            latest_rate = trends['readmission_rate'].iat[-1]
             avg_rate = trends['readmission_rate'].mean()
             
             if latest_rate < avg_rate:
@@ -171,14 +172,12 @@ st.markdown("---")
 st.subheader("Length of Stay Analysis")
 
 try:
-    los_data = query_to_df(QUERY_AVERAGE_LOS_BY_WARD)
-    
     if not los_data.empty:
         col1, col2 = st.columns([2, 1])
         
         with col1:
             fig = px.bar(
-                los_data.sort_values('avg_los', ascending=False),
+                los_data,
                 x='ward_name',
                 y='avg_los',
                 title='Average Length of Stay by Ward',
@@ -195,7 +194,6 @@ try:
             
             display_df = los_data[['ward_name', 'avg_los', 'admission_count']].copy()
             display_df.columns = ['Ward', 'Avg LOS', 'Admissions']
-            display_df = display_df.sort_values('Avg LOS', ascending=False)
             
             st.dataframe(display_df, hide_index=True, use_container_width=True)
     else:
@@ -258,9 +256,9 @@ try:
     disposition_query = """
     SELECT 
         discharge_disposition,
-        COUNT(*) as count,
-        ROUND(AVG(length_of_stay), 1) as avg_los
-    FROM fact_admissions
+        CAST(SUM(admission_count) AS INTEGER) as count,
+        ROUND(SUM(total_los) * 1.0 / SUM(los_count), 1) as avg_los
+    FROM agg_quality_daily
     WHERE discharge_date >= CURRENT_DATE - INTERVAL '90 days'
     GROUP BY discharge_disposition
     ORDER BY count DESC
@@ -306,15 +304,14 @@ try:
     recommendations = []
     
     # Check readmission rate
-    readmit = query_to_df(QUERY_READMISSION_RATE)
-    if not readmit.empty and readmit['readmission_rate'][0] > 12:
+    rate = quality_summary['readmission_rate'].iat[0] if not quality_summary.empty else None
+    if rate is not None and rate > 12:
         recommendations.append(
             ("High Readmission Rate", 
-             f"Current rate is {readmit['readmission_rate'][0]}%. Focus on discharge planning and follow-up care.")
+             f"Current rate is {rate}%. Focus on discharge planning and follow-up care.")
         )
     
     # Check LOS outliers
-    los_data = query_to_df(QUERY_AVERAGE_LOS_BY_WARD)
     if not los_data.empty:
         high_los_wards = los_data[los_data['avg_los'] > los_data['avg_los'].mean() + los_data['avg_los'].std()]
         if not high_los_wards.empty:
@@ -1,2 +1,9 @@
 # Utilities module
 
+import importlib.util
+
+import plotly.io as pio
+
+# Serialize figures with orjson when it is installed (much faster on numeric arrays)
+if importlib.util.find_spec('orjson') is not None:
+    pio.json.config.default_engine = 'orjson'
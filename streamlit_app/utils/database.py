@@ -10,11 +10,25 @@ Pipeline Role: Data access layer connecting Streamlit dashboards to the GOLD lay
 """
 
 import os
+import sys
+import threading
+import time
+from collections import OrderedDict
 import pandas as pd
 from pathlib import Path
 import duckdb
+import pyarrow as pa
+import streamlit as st
+from streamlit import runtime
 from dotenv import load_dotenv
 
+# Add project root to path so the module also runs as a script
+PROJECT_ROOT = str(Path(__file__).parent.parent.parent)
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from streamlit_app.utils.queries import SUMMARY_TABLES
+
 # Load environment variables
 load_dotenv()
 
@@ -22,18 +36,49 @@ load_dotenv()
 DATABASE_TYPE = os.getenv('DATABASE_TYPE', 'duckdb')
 DATABASE_PATH = os.getenv('DATABASE_PATH', './data/medicare_analytics.duckdb')
 
+# Optional DuckDB resource limits for small hosts (e.g. DUCKDB_THREADS=4, DUCKDB_MEMORY_LIMIT=1GB)
+DUCKDB_CONFIG = {
+    setting: value
+    for setting, value in (
+        ('threads', os.getenv('DUCKDB_THREADS')),
+        ('memory_limit', os.getenv('DUCKDB_MEMORY_LIMIT')),
+    )
+    if value
+}
+
+# Bounded in-process result cache for scripts and background jobs that run
+# outside Streamlit; inside the app query_to_df's st.cache_data does this job
+RESULT_CACHE_SIZE = 64
+RESULT_CACHE_TTL = 300
+
+# Text columns map to Arrow-backed pandas strings when results are fetched through Arrow
+_ARROW_STRING_TYPES = {
+    pa.string(): pd.StringDtype('pyarrow'),
+    pa.large_string(): pd.StringDtype('pyarrow'),
+}
+
+def _arrow_to_df(table):
+    """Convert an Arrow result to pandas, reading DECIMAL and HUGEINT columns as float64"""
+    schema = pa.schema([
+        field.with_type(pa.float64()) if pa.types.is_decimal(field.type) else field
+        for field in table.schema
+    ])
+    return table.cast(schema).to_pandas(types_mapper=_ARROW_STRING_TYPES.get, date_as_object=False)
+
 class DatabaseConnection:
     """Database connection handler supporting multiple backends"""
     
     def __init__(self):
         self.db_type = DATABASE_TYPE
         self.conn = None
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
         
     def connect(self):
         """Establish database connection"""
         if self.db_type == 'duckdb':
             # Use read-only mode to avoid file locking issues with Streamlit multi-page
-            self.conn = duckdb.connect(DATABASE_PATH, read_only=True)
+            self.conn = duckdb.connect(DATABASE_PATH, read_only=True, config=DUCKDB_CONFIG)
             return self.conn
         elif self.db_type == 'snowflake':
             try:
@@ -45,7 +90,9 @@ class DatabaseConnection:
                     database=os.getenv('SNOWFLAKE_DATABASE'),
                     warehouse=os.getenv('SNOWFLAKE_WAREHOUSE'),
                     schema=os.getenv('SNOWFLAKE_SCHEMA', 'GOLD'),
-                    role=os.getenv('SNOWFLAKE_ROLE', 'ACCOUNTADMIN')
+                    role=os.getenv('SNOWFLAKE_ROLE', 'ACCOUNTADMIN'),
+                    # Serve repeated dashboard queries from Snowflake's persisted result cache
+                    session_parameters={'USE_CACHED_RESULT': True}
                 )
                 return self.conn
             except ImportError:
@@ -54,26 +101,52 @@ class DatabaseConnection:
             raise ValueError(f"Unsupported database type: {self.db_type}")
     
     def execute_query(self, query, params=None):
-        """Execute a SQL query and return results as DataFrame"""
+        """Execute a SQL query and return results as DataFrame (served from the LRU cache when fresh)"""
+        if runtime.exists():
+            return self._fetch(query, params)
+        
+        key = (query, tuple(params) if params else None)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None and time.monotonic() - cached[0] < RESULT_CACHE_TTL:
+                self._cache.move_to_end(key)
+                return cached[1].copy()
+        
+        result = self._fetch(query, params)
+        
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > RESULT_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return result.copy()
+    
+    def _fetch(self, query, params=None):
+        """Run a SQL query against the backend and return results as DataFrame"""
         if self.conn is None:
             self.connect()
         
         try:
             if self.db_type == 'duckdb':
+                # Fetch as Arrow so text lands straight in Arrow-backed string columns
                 if params:
-                    result = self.conn.execute(query, params).fetchdf()
+                    result = self.conn.execute(query, params).fetch_arrow_table()
                 else:
-                    result = self.conn.execute(query).fetchdf()
-                return result
+                    result = self.conn.execute(query).fetch_arrow_table()
+                return _arrow_to_df(result)
             elif self.db_type == 'snowflake':
                 cursor = self.conn.cursor()
                 if params:
                     cursor.execute(query, params)
                 else:
                     cursor.execute(query)
-                result = cursor.fetch_pandas_all()
+                result = cursor.fetch_arrow_all()
+                columns = [column[0] for column in cursor.description]
                 cursor.close()
-                return result
+                # fetch_arrow_all returns None rather than an empty table when no rows match
+                if result is None:
+                    return pd.DataFrame(columns=columns)
+                return _arrow_to_df(result)
         except Exception as e:
             print(f"Query execution error: {e}")
             raise
@@ -83,20 +156,22 @@ class DatabaseConnection:
         if self.conn:
             self.conn.close()
             self.conn = None
+        self.clear_cache()
+    
+    def clear_cache(self):
+        """Drop all results held in the in-process LRU cache"""
+        with self._cache_lock:
+            self._cache.clear()
 
-# Global connection instance
-_db_connection = None
-
+@st.cache_resource(show_spinner=False)
 def get_db_connection():
-    """Get or create global database connection"""
-    global _db_connection
-    if _db_connection is None:
-        _db_connection = DatabaseConnection()
-    return _db_connection
+    """Get the database connection shared across reruns and sessions"""
+    return DatabaseConnection()
 
+@st.cache_data(ttl=300, max_entries=256, show_spinner=False)
 def query_to_df(query, params=None):
     """
-    Execute query and return pandas DataFrame
+    Execute query and return pandas DataFrame (cached per query and params for 5 minutes)
     
     Args:
         query (str): SQL query
@@ -108,9 +183,14 @@ def query_to_df(query, params=None):
     db = get_db_connection()
     return db.execute_query(query, params)
 
+def clear_query_caches():
+    """Drop cached query results from Streamlit's cache and the connection's LRU cache"""
+    st.cache_data.clear()
+    get_db_connection().clear_cache()
+
 def initialize_database_from_csv():
     """
-    Initialize DuckDB database from CSV files
+    Initialize DuckDB database from CSV files (and Parquet fact files, if generated)
     This is used for local development without Snowflake
     """
     if DATABASE_TYPE != 'duckdb':
@@ -128,23 +208,34 @@ def initialize_database_from_csv():
     if not raw_data_dir.exists():
         raise FileNotFoundError(f"Raw data directory not found: {raw_data_dir}")
     
-    # Load CSV files into DuckDB
-    csv_files = list(raw_data_dir.glob("*.csv"))
+    # Load CSV and Parquet files into DuckDB, listed by DuckDB's own glob()
+    csv_files = [Path(file) for (file,) in conn.execute("SELECT file FROM glob(?)", [str(raw_data_dir / "*.csv")]).fetchall()]
+    parquet_files = [Path(file) for (file,) in conn.execute("SELECT file FROM glob(?)", [str(raw_data_dir / "*.parquet")]).fetchall()]
     
-    if not csv_files:
+    if not csv_files and not parquet_files:
         raise FileNotFoundError(f"No CSV files found in {raw_data_dir}")
     
-    for csv_file in csv_files:
-        table_name = csv_file.stem  # e.g., 'dim_patients' from 'dim_patients.csv'
-        print(f"Loading {table_name}...")
-        
-        # Create table from CSV
-        conn.execute(f"""
-            CREATE OR REPLACE TABLE {table_name} AS
-            SELECT * FROM read_csv_auto('{csv_file}', header=True)
-        """)
+    # One table per file (e.g., 'dim_patients' from 'dim_patients.csv'),
+    # loaded in a single script so DuckDB runs each parallel scan back to back
+    load_statements = [
+        f"CREATE OR REPLACE TABLE {csv_file.stem} AS "
+        f"SELECT * FROM read_csv('{csv_file}', header=true, parallel=true, sample_size=-1)"
+        for csv_file in csv_files
+    ] + [
+        f"CREATE OR REPLACE TABLE {parquet_file.stem} AS "
+        f"SELECT * FROM read_parquet('{parquet_file}')"
+        for parquet_file in parquet_files
+    ]
+    
+    print(f"Loading {', '.join(f.stem for f in csv_files + parquet_files)}...")
+    conn.execute(";\n".join(load_statements))
     
-    print(f"Successfully loaded {len(csv_files)} tables into DuckDB")
+    print(f"Successfully loaded {len(csv_files) + len(parquet_files)} tables into DuckDB")
+    
+    # Precompute the dashboard summary tables from the loaded facts
+    for table_name, query in SUMMARY_TABLES.items():
+        print(f"Building {table_name}...")
+        conn.execute(f"CREATE OR REPLACE TABLE {table_name} AS {query}")
     
     # Verify
     tables = conn.execute("SHOW TABLES").fetchdf()
@@ -157,15 +248,26 @@ def test_connection():
     try:
         db = get_db_connection()
         
-        # Simple test query
-        result = db.execute_query("SELECT 1 as test")
+        # Simple test query, always sent to the database rather than a cache
+        result = db._fetch("SELECT 1 as test")
         
-        if result is not None and len(result) > 0:
-            print(f"Database connection successful! (Type: {DATABASE_TYPE})")
-            return True
-        else:
+        if result is None or len(result) == 0:
             print("Database connection failed: No result returned")
             return False
+        
+        # Pages read the precomputed summary tables, so a database built before
+        # they existed has to be re-initialized
+        for table_name in SUMMARY_TABLES:
+            try:
+                db._fetch(f"SELECT 1 FROM {table_name} LIMIT 0")
+            except Exception:
+                print(f"Database is missing summary table {table_name}; re-initialize it from CSV")
+                # Release the read-only handle so initialization can open the file for writing
+                db.close()
+                return False
+        
+        print(f"Database connection successful! (Type: {DATABASE_TYPE})")
+        return True
     except Exception as e:
         print(f"Database connection failed: {e}")
         return False
@@ -11,90 +11,99 @@ Pipeline Role: Analytics layer that transforms GOLD layer data into business ins
 
 # Executive Dashboard Queries
 
-QUERY_CURRENT_OCCUPANCY = """
+# Occupancy depends on CURRENT_DATE, so it is counted live; the other KPIs
+# only move when new data is loaded and come from the precomputed snapshot
+QUERY_EXECUTIVE_KPIS = """
 SELECT 
-    COUNT(DISTINCT a.patient_id) as current_patients,
-    (SELECT SUM(bed_capacity) FROM dim_wards) as total_beds,
-    ROUND(COUNT(DISTINCT a.patient_id) * 100.0 / (SELECT SUM(bed_capacity) FROM dim_wards), 1) as occupancy_rate
-FROM fact_admissions a
-WHERE a.discharge_date IS NULL OR a.discharge_date >= CURRENT_DATE
-"""
-
-QUERY_AVG_LENGTH_OF_STAY = """
-SELECT 
-    ROUND(AVG(length_of_stay), 1) as avg_los
-FROM fact_admissions
-WHERE discharge_date >= (SELECT MAX(discharge_date) FROM fact_admissions) - INTERVAL '60 days'
-  AND discharge_date IS NOT NULL
-"""
-
-QUERY_READMISSION_RATE = """
-SELECT 
-    ROUND(SUM(CASE WHEN is_readmission THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 1) as readmission_rate
-FROM fact_admissions
-WHERE discharge_date >= (SELECT MAX(discharge_date) FROM fact_admissions) - INTERVAL '60 days'
-  AND discharge_date IS NOT NULL
-"""
-
-QUERY_TODAY_ADMISSIONS = """
-SELECT 
-    COUNT(*) as today_admissions
-FROM fact_admissions
-WHERE admission_date = (SELECT MAX(admission_date) FROM fact_admissions)
+    (SELECT ROUND(COUNT(DISTINCT patient_id) * 100.0 / (SELECT SUM(bed_capacity) FROM dim_wards), 1)
+     FROM fact_admissions
+     WHERE discharge_date IS NULL OR discharge_date >= CURRENT_DATE) as occupancy_rate,
+    k.avg_los,
+    k.readmission_rate,
+    k.today_admissions
+FROM agg_executive_kpis k
 """
 
 QUERY_ADMISSION_TRENDS = """
-SELECT 
-    DATE_TRUNC('month', admission_date) as month,
-    COUNT(*) as admission_count
-FROM fact_admissions
-GROUP BY DATE_TRUNC('month', admission_date)
+SELECT month, admission_count
+FROM (
+    SELECT 
+        CAST(DATE_TRUNC('month', admission_date) AS DATE) as month,
+        CAST(SUM(admission_count) AS INTEGER) as admission_count
+    FROM agg_admissions_daily
+    GROUP BY DATE_TRUNC('month', admission_date)
+    ORDER BY month DESC
+    LIMIT 12
+) recent_months
 ORDER BY month
 """
 
 QUERY_REVENUE_BY_DEPARTMENT = """
 SELECT 
     w.department,
-    SUM(a.total_charges) as total_revenue,
-    COUNT(*) as admission_count
-FROM fact_admissions a
-JOIN dim_wards w ON a.ward_id = w.ward_id
-WHERE a.discharge_date >= (SELECT MAX(discharge_date) FROM fact_admissions) - INTERVAL '120 days'
-  AND a.discharge_date IS NOT NULL
+    SUM(q.total_charges) as total_revenue,
+    CAST(SUM(q.admission_count) AS INTEGER) as admission_count
+FROM agg_quality_daily q
+JOIN dim_wards w ON q.ward_id = w.ward_id
+WHERE q.discharge_date >= (SELECT MAX(discharge_date) FROM agg_quality_daily) - INTERVAL '120 days'
 GROUP BY w.department
 ORDER BY total_revenue DESC
 """
 
 QUERY_TOP_DIAGNOSES = """
+WITH top_diagnoses AS (
+    SELECT 
+        primary_diagnosis_id,
+        SUM(admission_count) as count
+    FROM agg_admissions_daily
+    WHERE admission_date >= (SELECT MAX(admission_date) FROM agg_admissions_daily) - INTERVAL '180 days'
+    GROUP BY primary_diagnosis_id
+    ORDER BY count DESC
+    LIMIT 10
+)
 SELECT 
     d.diagnosis_name,
     d.category,
-    COUNT(*) as count
-FROM fact_admissions a
-JOIN dim_diagnoses d ON a.primary_diagnosis_id = d.diagnosis_id
-WHERE a.admission_date >= (SELECT MAX(admission_date) FROM fact_admissions) - INTERVAL '180 days'
-GROUP BY d.diagnosis_name, d.category
+    CAST(t.count AS INTEGER) as count
+FROM top_diagnoses t
+JOIN dim_diagnoses d ON t.primary_diagnosis_id = d.diagnosis_id
 ORDER BY count DESC
-LIMIT 10
 """
 
 # Ward Operations Queries
 
 QUERY_BED_STATUS = """
+WITH current_admissions AS (
+    SELECT ward_id, COUNT(*) as current_patients
+    FROM fact_admissions
+    WHERE discharge_date IS NULL OR discharge_date >= CURRENT_DATE
+    GROUP BY ward_id
+),
+ward_beds AS (
+    SELECT 
+        w.ward_name,
+        w.bed_capacity,
+        COALESCE(c.current_patients, 0) as occupied_beds,
+        w.bed_capacity - COALESCE(c.current_patients, 0) as available_beds,
+        ROUND(COALESCE(c.current_patients, 0) * 100.0 / w.bed_capacity, 1) as occupancy_pct
+    FROM dim_wards w
+    LEFT JOIN current_admissions c ON w.ward_id = c.ward_id
+)
 SELECT 
-    w.ward_name,
-    w.bed_capacity,
-    COUNT(a.admission_id) as occupied_beds,
-    w.bed_capacity - COUNT(a.admission_id) as available_beds,
-    ROUND(COUNT(a.admission_id) * 100.0 / w.bed_capacity, 1) as occupancy_pct
-FROM dim_wards w
-LEFT JOIN fact_admissions a ON w.ward_id = a.ward_id 
-    AND (a.discharge_date IS NULL OR a.discharge_date >= CURRENT_DATE)
-GROUP BY w.ward_id, w.ward_name, w.bed_capacity
-ORDER BY w.ward_name
+    *,
+    CAST(SUM(bed_capacity) OVER () AS INTEGER) as total_beds,
+    CAST(SUM(occupied_beds) OVER () AS INTEGER) as total_occupied,
+    CAST(SUM(available_beds) OVER () AS INTEGER) as total_available
+FROM ward_beds
+ORDER BY ward_name
 """
 
 QUERY_DISCHARGE_FORECAST = """
+WITH upcoming_discharges AS (
+    SELECT patient_id, ward_id, primary_diagnosis_id, admission_date, discharge_date, length_of_stay
+    FROM fact_admissions
+    WHERE discharge_date BETWEEN CURRENT_DATE AND CURRENT_DATE + INTERVAL '2 days'
+)
 SELECT 
     p.mrn,
     p.first_name || ' ' || p.last_name as patient_name,
@@ -103,14 +112,31 @@ SELECT
     a.discharge_date,
     a.length_of_stay,
     d.diagnosis_name
-FROM fact_admissions a
+FROM upcoming_discharges a
 JOIN dim_patients p ON a.patient_id = p.patient_id
 JOIN dim_wards w ON a.ward_id = w.ward_id
 JOIN dim_diagnoses d ON a.primary_diagnosis_id = d.diagnosis_id
-WHERE a.discharge_date BETWEEN CURRENT_DATE AND CURRENT_DATE + INTERVAL '2 days'
 ORDER BY a.discharge_date, w.ward_name
 """
 
+QUERY_WARD_TYPE_OCCUPANCY = """
+WITH current_admissions AS (
+    SELECT ward_id, COUNT(*) as current_patients
+    FROM fact_admissions
+    WHERE discharge_date IS NULL OR discharge_date >= CURRENT_DATE
+    GROUP BY ward_id
+)
+SELECT 
+    w.ward_type,
+    CAST(COALESCE(SUM(c.current_patients), 0) AS INTEGER) as current_patients,
+    CAST(SUM(w.bed_capacity) AS INTEGER) as total_beds,
+    ROUND(COALESCE(SUM(c.current_patients), 0) * 100.0 / NULLIF(SUM(w.bed_capacity), 0), 1) as occupancy_rate
+FROM dim_wards w
+LEFT JOIN current_admissions c ON w.ward_id = c.ward_id
+GROUP BY w.ward_type
+ORDER BY occupancy_rate DESC
+"""
+
 # Patient Care Plan Queries
 
 QUERY_SEARCH_PATIENTS = """
@@ -119,6 +145,7 @@ SELECT
     p.mrn,
     p.first_name || ' ' || p.last_name as patient_name,
     p.date_of_birth,
+    CAST(FLOOR(DATEDIFF('day', p.date_of_birth, CURRENT_DATE) / 365) AS INTEGER) as age,
     p.gender,
     p.blood_type,
     a.admission_id,
@@ -134,39 +161,41 @@ JOIN dim_wards w ON a.ward_id = w.ward_id
 LEFT JOIN dim_beds b ON a.bed_id = b.bed_id
 JOIN dim_diagnoses d ON a.primary_diagnosis_id = d.diagnosis_id
 JOIN dim_staff s ON a.attending_doctor_id = s.staff_id
-WHERE (
-    p.mrn LIKE ? 
-    OR LOWER(p.first_name || ' ' || p.last_name) LIKE LOWER(?)
-    OR LOWER(w.ward_name) LIKE LOWER(?)
-  )
+WHERE p.mrn || '|' || p.first_name || ' ' || p.last_name || '|' || w.ward_name ILIKE ?
 ORDER BY a.admission_date DESC
 LIMIT 20
 """
 
 QUERY_PATIENT_DETAILS = """
+WITH latest_admission AS (
+    SELECT *
+    FROM fact_admissions
+    WHERE patient_id = ?
+    ORDER BY admission_date DESC
+    LIMIT 1
+)
 SELECT 
     p.*,
+    CAST(FLOOR(DATEDIFF('day', p.date_of_birth, CURRENT_DATE) / 365) AS INTEGER) as age,
     a.admission_id,
     a.admission_date,
     a.discharge_date,
     a.admission_type,
     a.chief_complaint,
     a.length_of_stay,
+    DATEDIFF('day', CAST(a.admission_date AS DATE), CAST(COALESCE(a.discharge_date, CURRENT_DATE) AS DATE)) as los_days,
     w.ward_name,
     w.department,
     b.bed_number,
     d.diagnosis_name,
     d.severity_level,
     s.first_name || ' ' || s.last_name as attending_doctor
-FROM dim_patients p
-JOIN fact_admissions a ON p.patient_id = a.patient_id
+FROM latest_admission a
+JOIN dim_patients p ON a.patient_id = p.patient_id
 JOIN dim_wards w ON a.ward_id = w.ward_id
 LEFT JOIN dim_beds b ON a.bed_id = b.bed_id
 JOIN dim_diagnoses d ON a.primary_diagnosis_id = d.diagnosis_id
 JOIN dim_staff s ON a.attending_doctor_id = s.staff_id
-WHERE p.patient_id = ?
-ORDER BY a.admission_date DESC
-LIMIT 1
 """
 
 QUERY_PATIENT_MEDICATIONS = """
@@ -185,7 +214,7 @@ JOIN dim_medications m ON mar.medication_id = m.medication_id
 LEFT JOIN dim_staff s ON mar.administered_by_staff_id = s.staff_id
 WHERE mar.admission_id = ?
   AND mar.scheduled_datetime >= CURRENT_DATE - INTERVAL '3 days'
-ORDER BY mar.scheduled_datetime DESC
+ORDER BY m.drug_name, mar.scheduled_datetime DESC
 """
 
 QUERY_PATIENT_VITALS = """
@@ -214,6 +243,7 @@ SELECT
     breakfast_percent_consumed,
     lunch_percent_consumed,
     dinner_percent_consumed,
+    (breakfast_percent_consumed + lunch_percent_consumed + dinner_percent_consumed) / 3.0 as avg_meal_pct,
     bathroom_independence,
     mental_status,
     mood,
@@ -229,20 +259,24 @@ LIMIT 7
 """
 
 QUERY_PATIENT_LABS = """
-SELECT 
-    lab_id,
-    test_type,
-    test_name,
-    test_value,
-    unit_of_measure,
-    reference_range,
-    abnormal_flag,
-    collected_datetime,
-    resulted_datetime
-FROM fact_lab_results
-WHERE admission_id = ?
-ORDER BY collected_datetime DESC
-LIMIT 20
+SELECT *
+FROM (
+    SELECT 
+        lab_id,
+        test_type,
+        test_name,
+        test_value,
+        unit_of_measure,
+        reference_range,
+        abnormal_flag,
+        collected_datetime,
+        resulted_datetime
+    FROM fact_lab_results
+    WHERE admission_id = ?
+    ORDER BY collected_datetime DESC
+    LIMIT 20
+)
+ORDER BY test_type, collected_datetime DESC
 """
 
 QUERY_PATIENT_PROCEDURES = """
@@ -292,6 +326,7 @@ JOIN dim_wards w ON a.ward_id = w.ward_id
 JOIN dim_diagnoses d ON a.primary_diagnosis_id = d.diagnosis_id
 WHERE a.patient_id = ?
   AND a.discharge_date < CURRENT_DATE
+  AND a.admission_date >= CURRENT_DATE - INTERVAL '5 years'
 ORDER BY a.admission_date DESC
 LIMIT 10
 """
@@ -302,12 +337,14 @@ QUERY_MEDICATION_ADHERENCE = """
 SELECT 
     w.ward_name,
     COUNT(*) as total_doses,
-    SUM(CASE WHEN mar.status = 'Given' THEN 1 ELSE 0 END) as doses_given,
-    ROUND(SUM(CASE WHEN mar.status = 'Given' THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 1) as adherence_rate
+    COUNT_IF(mar.status = 'Given') as doses_given,
+    ROUND(COUNT_IF(mar.status = 'Given') * 100.0 / COUNT(*), 1) as adherence_rate,
+    CAST(SUM(COUNT(*)) OVER () AS INTEGER) as overall_doses,
+    CAST(SUM(COUNT_IF(mar.status = 'Given')) OVER () AS INTEGER) as overall_doses_given
 FROM fact_medication_administration mar
 JOIN fact_admissions a ON mar.admission_id = a.admission_id
 JOIN dim_wards w ON a.ward_id = w.ward_id
-WHERE mar.scheduled_datetime >= (SELECT MAX(scheduled_datetime) FROM fact_medication_administration) - INTERVAL '30 days'
+WHERE mar.scheduled_datetime >= (SELECT max_scheduled_datetime FROM agg_medication_clock) - INTERVAL '30 days'
 GROUP BY w.ward_name
 ORDER BY adherence_rate
 """
@@ -320,7 +357,7 @@ SELECT
 FROM fact_medication_administration mar
 JOIN fact_admissions a ON mar.admission_id = a.admission_id
 JOIN dim_wards w ON a.ward_id = w.ward_id
-WHERE mar.scheduled_datetime >= (SELECT MAX(scheduled_datetime) FROM fact_medication_administration) - INTERVAL '60 days'
+WHERE mar.scheduled_datetime >= (SELECT max_scheduled_datetime FROM agg_medication_clock) - INTERVAL '60 days'
   AND mar.status IN ('Missed', 'Refused', 'Held')
 GROUP BY w.ward_name, mar.status
 ORDER BY w.ward_name, count DESC
@@ -334,7 +371,7 @@ SELECT
     SUM(m.cost_per_unit) as total_cost
 FROM fact_medication_administration mar
 JOIN dim_medications m ON mar.medication_id = m.medication_id
-WHERE mar.scheduled_datetime >= (SELECT MAX(scheduled_datetime) FROM fact_medication_administration) - INTERVAL '90 days'
+WHERE mar.scheduled_datetime >= (SELECT max_scheduled_datetime FROM agg_medication_clock) - INTERVAL '90 days'
 GROUP BY m.medication_id, m.drug_name, m.drug_class
 ORDER BY administration_count DESC
 LIMIT 15
@@ -343,18 +380,24 @@ LIMIT 15
 # Quality & Outcomes Queries
 
 QUERY_READMISSION_BY_DIAGNOSIS = """
+WITH diagnosis_counts AS (
+    SELECT 
+        primary_diagnosis_id,
+        SUM(admission_count) as total_admissions,
+        SUM(readmissions) as readmissions
+    FROM agg_quality_daily
+    WHERE discharge_date >= (SELECT MAX(discharge_date) FROM agg_quality_daily) - INTERVAL '180 days'
+    GROUP BY primary_diagnosis_id
+    HAVING SUM(admission_count) >= 10
+)
 SELECT 
     d.diagnosis_name,
     d.category,
-    COUNT(*) as total_admissions,
-    SUM(CASE WHEN a.is_readmission THEN 1 ELSE 0 END) as readmissions,
-    ROUND(SUM(CASE WHEN a.is_readmission THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 1) as readmission_rate
-FROM fact_admissions a
-JOIN dim_diagnoses d ON a.primary_diagnosis_id = d.diagnosis_id
-WHERE a.discharge_date >= (SELECT MAX(discharge_date) FROM fact_admissions) - INTERVAL '180 days'
-  AND a.discharge_date IS NOT NULL
-GROUP BY d.diagnosis_name, d.category
-HAVING COUNT(*) >= 10
+    CAST(c.total_admissions AS INTEGER) as total_admissions,
+    CAST(c.readmissions AS INTEGER) as readmissions,
+    ROUND(c.readmissions * 100.0 / c.total_admissions, 1) as readmission_rate
+FROM diagnosis_counts c
+JOIN dim_diagnoses d ON c.primary_diagnosis_id = d.diagnosis_id
 ORDER BY readmission_rate DESC
 LIMIT 10
 """
@@ -363,15 +406,86 @@ QUERY_AVERAGE_LOS_BY_WARD = """
 SELECT 
     w.ward_name,
     w.ward_type,
-    COUNT(*) as admission_count,
-    ROUND(AVG(a.length_of_stay), 1) as avg_los,
-    MIN(a.length_of_stay) as min_los,
-    MAX(a.length_of_stay) as max_los
-FROM fact_admissions a
-JOIN dim_wards w ON a.ward_id = w.ward_id
-WHERE a.discharge_date >= (SELECT MAX(discharge_date) FROM fact_admissions) - INTERVAL '120 days'
-  AND a.discharge_date IS NOT NULL
+    CAST(SUM(q.admission_count) AS INTEGER) as admission_count,
+    ROUND(SUM(q.total_los) * 1.0 / SUM(q.los_count), 1) as avg_los,
+    MIN(q.min_los) as min_los,
+    MAX(q.max_los) as max_los
+FROM agg_quality_daily q
+JOIN dim_wards w ON q.ward_id = w.ward_id
+WHERE q.discharge_date >= (SELECT MAX(discharge_date) FROM agg_quality_daily) - INTERVAL '120 days'
 GROUP BY w.ward_name, w.ward_type
 ORDER BY avg_los DESC
 """
 
+# Readmission rate and 30-day average LOS for the summary cards in one round-trip
+QUERY_QUALITY_SUMMARY = """
+SELECT 
+    (
+        SELECT ROUND(SUM(readmissions) * 100.0 / SUM(admission_count), 1)
+        FROM agg_quality_daily
+        WHERE discharge_date >= (SELECT MAX(discharge_date) FROM agg_quality_daily) - INTERVAL '60 days'
+    ) as readmission_rate,
+    (
+        SELECT ROUND(SUM(total_los) * 1.0 / SUM(los_count), 1)
+        FROM agg_quality_daily
+        WHERE discharge_date >= CURRENT_DATE - INTERVAL '30 days'
+    ) as avg_los
+"""
+
+# Summary Tables
+# Precomputed when the database is initialized (and by the Gold_Aggregates
+# job in Snowflake) so the dashboards read a few rows instead of
+# re-aggregating fact_admissions for every viewer. They only hold figures
+# that change when data is loaded; anything relative to CURRENT_DATE (current
+# occupancy) is queried live instead. The daily roll-ups are
+# written in date order so trailing-window filters skip whole row groups
+# (DuckDB zone maps) or micro-partitions (Snowflake pruning)
+
+SUMMARY_TABLES = {
+    'agg_executive_kpis': """
+WITH recent_discharges AS (
+    SELECT length_of_stay, is_readmission
+    FROM fact_admissions
+    WHERE discharge_date >= (SELECT MAX(discharge_date) FROM fact_admissions) - INTERVAL '60 days'
+      AND discharge_date IS NOT NULL
+)
+SELECT 
+    (SELECT ROUND(AVG(length_of_stay), 1) FROM recent_discharges) as avg_los,
+    (SELECT ROUND(COUNT_IF(is_readmission) * 100.0 / COUNT(*), 1)
+     FROM recent_discharges) as readmission_rate,
+    (SELECT COUNT(*) FROM fact_admissions
+     WHERE admission_date = (SELECT MAX(admission_date) FROM fact_admissions)) as today_admissions
+""",
+    'agg_quality_daily': """
+SELECT 
+    discharge_date,
+    ward_id,
+    primary_diagnosis_id,
+    discharge_disposition,
+    COUNT(*) as admission_count,
+    CAST(COUNT_IF(is_readmission) AS INTEGER) as readmissions,
+    COUNT(length_of_stay) as los_count,
+    CAST(SUM(length_of_stay) AS INTEGER) as total_los,
+    MIN(length_of_stay) as min_los,
+    MAX(length_of_stay) as max_los,
+    SUM(total_charges) as total_charges
+FROM fact_admissions
+WHERE discharge_date IS NOT NULL
+GROUP BY discharge_date, ward_id, primary_diagnosis_id, discharge_disposition
+ORDER BY discharge_date
+""",
+    'agg_admissions_daily': """
+SELECT 
+    admission_date,
+    ward_id,
+    primary_diagnosis_id,
+    COUNT(*) as admission_count
+FROM fact_admissions
+GROUP BY admission_date, ward_id, primary_diagnosis_id
+ORDER BY admission_date
+""",
+    'agg_medication_clock': """
+SELECT MAX(scheduled_datetime) as max_scheduled_datetime
+FROM fact_medication_administration
+""",
+}